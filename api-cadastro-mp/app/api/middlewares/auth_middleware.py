@@ -5,9 +5,8 @@ from typing import Any, Callable, TypeVar
 from flask import request, g
 
 from app.core.exceptions import UnauthorizedError, ForbiddenError
-from app.infrastructure.database.session import db_session
-from app.infrastructure.security.jwt_provider import JwtProvider
-from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.infrastructure.cache.revoked_token_cache import revoked_token_cache
+from app.infrastructure.security.jwt_provider import jwt_provider
 
 F = TypeVar("F", bound=Callable[..., Any])
 
@@ -28,24 +27,22 @@ def require_auth(fn: F) -> F:
             return ("", 204)
 
         token = _get_bearer_token()
-        jwt_provider = JwtProvider()
 
-        with db_session() as session:
-            revoked_repo = RevokedTokenRepository(session)
-            claims = jwt_provider.decode(token)
+        claims = jwt_provider.decode(token)
 
-            if claims.get("typ") != "access":
-                raise UnauthorizedError("Token inválido.")
+        if claims.get("typ") != "access":
+            raise UnauthorizedError("Token inválido.")
 
-            jti = claims.get("jti")
-            if not jti:
-                raise UnauthorizedError("Token inválido.")
+        jti = claims.get("jti")
+        if not jti:
+            raise UnauthorizedError("Token inválido.")
 
-            if revoked_repo.is_revoked(str(jti)):
-                raise UnauthorizedError("Token revogado.")
+        # ✅ revogados em memória (delta sync + LISTEN/NOTIFY), sem abrir sessão no banco
+        if revoked_token_cache.is_revoked(str(jti)):
+            raise UnauthorizedError("Token revogado.")
 
-            # disponibiliza claims para as rotas
-            g.auth = claims
+        # disponibiliza claims para as rotas
+        g.auth = claims
 
         return fn(*args, **kwargs)
 
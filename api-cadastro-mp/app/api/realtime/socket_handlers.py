@@ -7,7 +7,24 @@ from flask_socketio import disconnect, join_room, leave_room
 import jwt
 
 from app.config.settings import settings
+from app.core.exceptions import AppError
+from app.infrastructure.database.session import db_session
+from app.infrastructure.realtime.rooms import conversation_room, role_room, user_room
+from app.infrastructure.realtime.session_registry import session_registry
 from app.infrastructure.realtime.socketio_server import socketio
+from app.repositories.conversation_repository import ConversationRepository
+from app.repositories.message_repository import MessageRepository
+from app.repositories.product_field_repository import ProductFieldRepository
+from app.repositories.product_repository import ProductRepository
+from app.repositories.request_item_field_repository import RequestItemFieldRepository
+from app.repositories.request_item_repository import RequestItemRepository
+from app.repositories.request_repository import RequestRepository
+from app.repositories.request_status_repository import RequestStatusRepository
+from app.repositories.request_type_repository import RequestTypeRepository
+from app.repositories.totvs_product_mirror_repository import TotvsProductMirrorRepository
+from app.repositories.totvs_product_repository import TotvsProductRepository
+from app.services.conversation_service import ConversationService
+from app.services.request_service import RequestService
 
 
 def _get_bearer_token() -> str | None:
@@ -24,6 +41,48 @@ def _get_bearer_token() -> str | None:
     return None
 
 
+def _build_request_service(session) -> RequestService:
+    # somente leitura (snapshot): sem notifier
+    return RequestService(
+        conv_repo=ConversationRepository(session),
+        msg_repo=MessageRepository(session),
+        req_repo=RequestRepository(session),
+        item_repo=RequestItemRepository(session),
+        field_repo=RequestItemFieldRepository(session),
+        status_repo=RequestStatusRepository(session),
+        type_repo=RequestTypeRepository(session),
+        product_repo=ProductRepository(session),
+        pfield_repo=ProductFieldRepository(session),
+        totvs_repo=TotvsProductRepository(TotvsProductMirrorRepository(session)),
+    )
+
+
+def _join(room: str) -> None:
+    join_room(room)
+    session_registry.joined(request.sid, room)
+
+
+def _leave(room: str) -> None:
+    leave_room(room)
+    session_registry.left(request.sid, room)
+
+
+def _can_access_conversation(*, user_id: int, role_id: int, conversation_id: int) -> bool:
+    # mesma regra do GET /api/conversations/<id>
+    def _load() -> bool:
+        with db_session() as session:
+            svc = ConversationService(ConversationRepository(session), notifier=None)
+            try:
+                svc.get_conversation(
+                    conversation_id=conversation_id, user_id=user_id, role_id=role_id)
+            except AppError:
+                return False
+        return True
+
+    return session_registry.can_join_conversation(
+        user_id=user_id, conversation_id=conversation_id, loader=_load)
+
+
 def register_socket_handlers() -> None:
     @socketio.on("connect")
     def on_connect():
@@ -59,16 +118,75 @@ def register_socket_handlers() -> None:
             disconnect()
             return False
 
-        request.environ["auth_user_id"] = int(payload["sub"])
+        user_id = int(payload["sub"])
+        request.environ["auth_user_id"] = user_id
+        request.environ["auth_role_id"] = (
+            int(payload["role_id"]) if payload.get("role_id") is not None else None
+        )
+
+        session_registry.connect(
+            request.sid, user_id=user_id, role_id=request.environ["auth_role_id"])
+
+        # ✅ rooms fixas da sessão: eventos são direcionados (sem broadcast global)
+        _join(user_room(user_id))
+        if payload.get("role_id") is not None:
+            room = role_room(int(payload["role_id"]))
+            if room:
+                _join(room)
+
+    @socketio.on("disconnect")
+    def on_disconnect():
+        session_registry.disconnect(request.sid)
 
     @socketio.on("conversation:join")
     def on_join(data: dict):
-        conversation_id = int(data.get("conversation_id"))
-        join_room(f"conversation:{conversation_id}")
-        socketio.emit("conversation:joined", {"conversation_id": conversation_id})
+        user_id = request.environ.get("auth_user_id")
+        role_id = request.environ.get("auth_role_id")
+        try:
+            conversation_id = int((data or {}).get("conversation_id"))
+        except (TypeError, ValueError):
+            return
+        if user_id is None or role_id is None:
+            return
+
+        # ✅ só entra na room quem pode ver a conversa; resposta só para este socket
+        if not _can_access_conversation(
+            user_id=int(user_id), role_id=int(role_id), conversation_id=conversation_id
+        ):
+            socketio.emit(
+                "conversation:join_denied", {"conversation_id": conversation_id}, to=request.sid)
+            return
+
+        _join(conversation_room(conversation_id))
+        socketio.emit("conversation:joined", {"conversation_id": conversation_id}, to=request.sid)
 
     @socketio.on("conversation:leave")
     def on_leave(data: dict):
-        conversation_id = int(data.get("conversation_id"))
-        leave_room(f"conversation:{conversation_id}")
-        socketio.emit("conversation:left", {"conversation_id": conversation_id})
+        try:
+            conversation_id = int((data or {}).get("conversation_id"))
+        except (TypeError, ValueError):
+            return
+
+        _leave(conversation_room(conversation_id))
+        socketio.emit("conversation:left", {"conversation_id": conversation_id}, to=request.sid)
+
+    @socketio.on("request:resync")
+    def on_request_resync(data: dict):
+        """
+        Cliente percebeu salto de versão em request:item_changed:
+        devolve só para ele o request completo + versão atual.
+        """
+        user_id = request.environ.get("auth_user_id")
+        role_id = request.environ.get("auth_role_id")
+        if user_id is None or role_id is None:
+            return
+
+        try:
+            request_id = int((data or {}).get("request_id"))
+            with db_session() as session:
+                snapshot = _build_request_service(session).get_request_snapshot(
+                    request_id=request_id, user_id=int(user_id), role_id=int(role_id))
+        except (TypeError, ValueError, AppError):
+            return
+
+        socketio.emit("request:snapshot", snapshot, to=request.sid)
@@ -3,7 +3,7 @@ from flask import Blueprint, jsonify, request, g
 from app.api.middlewares.auth_middleware import require_auth
 from app.api.schemas.user_schema import LoginRequest, RefreshRequest, TokenPairResponse, LogoutRequest
 from app.infrastructure.database.session import db_session
-from app.infrastructure.security.jwt_provider import JwtProvider
+from app.infrastructure.security.jwt_provider import jwt_provider
 from app.repositories.audit_log_repository import AuditLogRepository
 from app.repositories.refresh_token_repository import RefreshTokenRepository
 from app.repositories.revoked_token_repository import RevokedTokenRepository
@@ -17,7 +17,7 @@ from app.core.audit.audit_entities import AuditEntity
 from app.core.audit.audit_actions import AuditAction
 
 from app.config.settings import settings
-from app.infrastructure.security.central_jwt_validator import CentralJwtValidator
+from app.infrastructure.security.central_jwt_validator import get_central_jwt_validator
 
 bp_auth = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -38,7 +38,6 @@ def login():
                       user_id=None, details=f"email={payload.email}")
             raise
 
-        jwt_provider = JwtProvider()
         access = jwt_provider.issue_access_token(
             subject=str(user.id),
             payload={"email": user.email, "role_id": user.role_id,
@@ -67,7 +66,7 @@ def sso_login():
     if not central_token:
         return jsonify({"error": "Token SSO ausente."}), 401
 
-    identity = CentralJwtValidator().extract_identity(central_token)
+    identity = get_central_jwt_validator().extract_identity(central_token)
 
     with db_session() as session:
         audit = AuditService(AuditLogRepository(session))
@@ -79,7 +78,6 @@ def sso_login():
             role_id=settings.central_default_role_id,
         )
 
-        jwt_provider = JwtProvider()
         access = jwt_provider.issue_access_token(
             subject=str(user.id),
             payload={
@@ -120,7 +118,6 @@ def refresh():
     payload = RefreshRequest.model_validate(request.get_json(force=True))
 
     with db_session() as session:
-        jwt_provider = JwtProvider()
         audit = AuditService(AuditLogRepository(session))
 
         refresh_svc = RefreshTokenService(
@@ -160,7 +157,6 @@ def logout():
     token = auth_header.split()[1]  # já validado pelo middleware
 
     with db_session() as session:
-        jwt_provider = JwtProvider()
         audit = AuditService(AuditLogRepository(session))
 
         # revoga access token
@@ -36,7 +36,7 @@ bp_conv = Blueprint("conversations", __name__, url_prefix="/conversations")
 def _build_service(session) -> ConversationService:
     return ConversationService(
         ConversationRepository(session),
-        notifier=SocketIOConversationNotifier(),
+        notifier=SocketIOConversationNotifier(session),
     )
 
 
@@ -1,7 +1,11 @@
 from flask import Blueprint, jsonify
 from sqlalchemy import text
 
+from app.api.middlewares.auth_middleware import require_auth, require_roles
 from app.infrastructure.database.session import db_session
+from app.infrastructure.realtime.realtime_dispatcher import realtime_dispatcher
+from app.infrastructure.realtime.session_registry import session_registry
+from app.infrastructure.security.password_hasher import password_hash_pool
 
 bp_health = Blueprint("health", __name__, url_prefix="/health")
 
@@ -16,3 +20,19 @@ def health_db():
     with db_session() as session:
         session.execute(text("select 1"))
     return jsonify({"db": "ok"}), 200
+
+
+@bp_health.get("/password-hasher")
+@require_auth
+@require_roles(1)
+def health_password_hasher():
+    # fila/tempos do hash de senha deste worker
+    return jsonify(password_hash_pool.stats()), 200
+
+
+@bp_health.get("/realtime")
+@require_auth
+@require_roles(1)
+def health_realtime():
+    # sessões/rooms e fila de eventos deste worker
+    return jsonify({**session_registry.stats(), **realtime_dispatcher.stats()}), 200
@@ -34,6 +34,7 @@ from app.repositories.product_field_repository import ProductFieldRepository
 from app.repositories.request_status_repository import RequestStatusRepository
 from app.repositories.request_type_repository import RequestTypeRepository
 from app.repositories.totvs_product_repository import TotvsProductRepository
+from app.repositories.totvs_product_mirror_repository import TotvsProductMirrorRepository
 
 from app.services.request_service import RequestService
 from app.services.message_service import MessageService
@@ -178,8 +179,8 @@ def _build_service(session) -> MessageService:
         type_repo=RequestTypeRepository(session),
         product_repo=ProductRepository(session),
         pfield_repo=ProductFieldRepository(session),
-        totvs_repo=TotvsProductRepository(),
-        notifier=SocketIORequestNotifier(),
+        totvs_repo=TotvsProductRepository(TotvsProductMirrorRepository(session)),
+        notifier=SocketIORequestNotifier(session),
     )
 
     return MessageService(
@@ -189,7 +190,7 @@ def _build_service(session) -> MessageService:
         file_repo=MessageFileRepository(session),
         req_repo=RequestRepository(session),
         type_repo=MessageTypeRepository(session),
-        notifier=SocketIOMessageNotifier(),
+        notifier=SocketIOMessageNotifier(session),
         req_service=req_service,
     )
 
@@ -198,11 +199,53 @@ def _build_service(session) -> MessageService:
 # Rotas (consulta)
 # -------------------------
 
+def _parse_optional_int(raw: str | None) -> int | None:
+    if raw in (None, ""):
+        return None
+    return int(raw)
+
+
 @bp_msg.get("")
 @require_auth
 def list_messages(conversation_id: int):
+    """
+    Sem before_id/after_id: lista completa (array), mantida por compatibilidade.
+    Com before_id/after_id (paginação por cursor):
+      ?before_id=&limit=50        -> 50 mais recentes
+      ?before_id=<id>&limit=50    -> 50 anteriores a <id> (scroll para trás)
+      ?after_id=<id>&limit=50     -> 50 posteriores a <id>
+    Retorna { items, limit, next_cursor, has_more }.
+    """
     user_id, role_id = _auth_user()
 
+    if "before_id" in request.args or "after_id" in request.args:
+        try:
+            before_id = _parse_optional_int(request.args.get("before_id"))
+            after_id = _parse_optional_int(request.args.get("after_id"))
+            limit = max(1, min(int(request.args.get("limit") or 50), 200))
+        except ValueError:
+            return jsonify({"error": "Parâmetros before_id/after_id/limit inválidos."}), 400
+
+        with db_session() as session:
+            svc = _build_service(session)
+            items, next_cursor, has_more = svc.list_messages_page(
+                conversation_id=conversation_id,
+                user_id=user_id,
+                role_id=role_id,
+                limit=limit,
+                before_id=before_id,
+                after_id=after_id,
+            )
+
+        return jsonify(
+            {
+                "items": [_pack_response(x) for x in items],
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+            }
+        ), 200
+
     with db_session() as session:
         svc = _build_service(session)
         items = svc.list_messages(
@@ -4,13 +4,14 @@ from __future__ import annotations
 
 from flask import Blueprint, jsonify, request, g
 
-from app.api.middlewares.auth_middleware import require_auth
+from app.api.middlewares.auth_middleware import require_auth, require_roles
 from app.infrastructure.database.session import db_session
 
 from app.repositories.product_repository import ProductRepository
 from app.repositories.product_field_repository import ProductFieldRepository
 from app.repositories.request_item_repository import RequestItemRepository
 from app.repositories.totvs_product_repository import TotvsProductRepository
+from app.repositories.totvs_product_mirror_repository import TotvsProductMirrorRepository
 
 from app.services.product_service import ProductService
 from app.services.product_query_service import ProductQueryService
@@ -20,6 +21,7 @@ from app.api.schemas.product_schema import (
     ProductListRowResponse,
     ProductResponse,
     ProductFieldResponse,
+    TotvsBatchInput,
 )
 
 from app.infrastructure.realtime.socketio_product_notifier import SocketIOProductNotifier
@@ -47,13 +49,13 @@ def _build_service(session) -> ProductService:
         product_repo=ProductRepository(session),
         pfield_repo=ProductFieldRepository(session),
         item_repo=RequestItemRepository(session),
-        product_notifier=SocketIOProductNotifier(),
+        product_notifier=SocketIOProductNotifier(session),
     )
 
 def _build_query_service(session) -> ProductQueryService:
     return ProductQueryService(
         session,
-        totvs_prod_repo=TotvsProductRepository(),
+        totvs_prod_repo=TotvsProductRepository(TotvsProductMirrorRepository(session)),
     )
 
 
@@ -83,6 +85,10 @@ def list_products():
     date_from = (request.args.get("date_from") or "").strip() or None
     date_to = (request.args.get("date_to") or "").strip() or None
 
+    sort = (request.args.get("sort") or "recent").strip().lower()
+    if sort not in ("recent", "relevance"):
+        return jsonify({"error": "Parâmetro sort inválido. Use: recent | relevance"}), 400
+
     with db_session() as session:
         svc = _build_query_service(session)
         rows, total = svc.list_products(
@@ -92,6 +98,7 @@ def list_products():
             flag=flag_mode,
             date_from=date_from,
             date_to=date_to,
+            sort=sort,
         )
 
     payload = ProductListResponse(
@@ -205,3 +212,31 @@ def get_product_by_code_totvs(product_code: str):
 
     return jsonify({"totvs": totvs}), 200
 
+
+@bp_prod.post("/totvs/batch")
+@require_auth
+def get_products_by_codes_totvs():
+    payload = TotvsBatchInput.model_validate(request.get_json(force=True))
+
+    with db_session() as session:
+        svc = _build_query_service(session)
+        items, not_found = svc.get_products_totvs(product_codes=payload.codes)
+
+    return jsonify({"items": items, "not_found": not_found}), 200
+
+
+@bp_prod.get("/totvs/cache")
+@require_auth
+@require_roles(1)
+def get_totvs_cache_stats():
+    return jsonify(TotvsProductRepository().cache_stats()), 200
+
+
+@bp_prod.delete("/totvs/cache")
+@require_auth
+@require_roles(1)
+def invalidate_totvs_cache():
+    code = (request.args.get("code") or "").strip() or None
+    TotvsProductRepository().invalidate_cache(code)
+    return ("", 204)
+
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import date
+import base64
+from datetime import date, datetime
 from flask import Blueprint, jsonify, g, request
 
 from app.api.middlewares.auth_middleware import require_auth
@@ -39,6 +40,7 @@ from app.services.request_service import RequestService
 from app.services.audit_service import AuditService
 from app.repositories.audit_log_repository import AuditLogRepository
 from app.repositories.totvs_product_repository import TotvsProductRepository
+from app.repositories.totvs_product_mirror_repository import TotvsProductMirrorRepository
 
 from app.infrastructure.realtime.socketio_request_notifier import SocketIORequestNotifier
 
@@ -68,8 +70,8 @@ def _build_service(session) -> RequestService:
         type_repo=RequestTypeRepository(session),
         product_repo=ProductRepository(session),
         pfield_repo=ProductFieldRepository(session),
-        totvs_repo=TotvsProductRepository(),
-        notifier=SocketIORequestNotifier(),
+        totvs_repo=TotvsProductRepository(TotvsProductMirrorRepository(session)),
+        notifier=SocketIORequestNotifier(session),
     )
 
 
@@ -142,6 +144,22 @@ def _parse_date_yyyy_mm_dd(s: str | None) -> date | None:
         return None
 
 
+def _encode_cursor(dt: datetime, item_id: int) -> str:
+    raw = f"{dt.isoformat()}|{int(item_id)}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(s: str | None) -> tuple[datetime, int] | None:
+    if not s:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(s.encode("ascii")).decode("utf-8")
+        dt_raw, id_raw = raw.rsplit("|", 1)
+        return datetime.fromisoformat(dt_raw), int(id_raw)
+    except Exception:
+        return None
+
+
 # -------------------------
 # Request CRUD
 # -------------------------
@@ -508,6 +526,16 @@ def list_request_items():
     if (request.args.get("date_from") and date_from is None) or (request.args.get("date_to") and date_to is None):
         return jsonify({"error": "date_from/date_to inválidos. Use YYYY-MM-DD."}), 400
 
+    # ✅ paginação keyset: ?cursor=<next_cursor da página anterior> (offset é ignorado)
+    cursor = _decode_cursor(request.args.get("cursor"))
+    if request.args.get("cursor") and cursor is None:
+        return jsonify({"error": "cursor inválido."}), 400
+
+    # ✅ total: exact (padrão) | estimate (plano do Postgres) | none (não calcula)
+    count_mode = (request.args.get("count") or "exact").strip().lower()
+    if count_mode not in ("exact", "estimate", "none"):
+        return jsonify({"error": "count inválido. Use: exact | estimate | none"}), 400
+
     with db_session() as session:
         svc = _build_service(session)
         rows, total = svc.list_request_items(
@@ -523,13 +551,22 @@ def list_request_items():
             date_from=date_from,
             date_to=date_to,
             date_mode=date_mode,
+            cursor=cursor,
+            count_mode=count_mode,
         )
 
+    next_cursor = None
+    if limit is not None and rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = _encode_cursor(
+            last["item_updated_at"] or last["item_created_at"], last["item_id"])
+
     payload = RequestItemListResponse(
         items=[RequestItemListRowResponse(**r) for r in rows],
-        total=int(total),
+        total=total,
         limit=limit,
-        offset=offset,
+        offset=offset if cursor is None else None,
+        next_cursor=next_cursor,
     ).model_dump()
 
     return jsonify(payload), 200
@@ -1,7 +1,7 @@
 # app/api/schemas/product_schema.py
 
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 class ProductFieldResponse(BaseModel):
@@ -34,3 +34,6 @@ class ProductListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+
+class TotvsBatchInput(BaseModel):
+    codes: list[str] = Field(min_length=1, max_length=2000)
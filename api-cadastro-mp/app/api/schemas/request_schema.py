@@ -141,9 +141,13 @@ class RequestItemListRowResponse(BaseModel):
 
 class RequestItemListResponse(BaseModel):
     items: List[RequestItemListRowResponse]
-    total: int
-    limit: int
-    offset: int
+    # None quando count=none
+    total: Optional[int] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+
+    # paginação keyset (cursor opaco para a próxima página)
+    next_cursor: Optional[str] = None
 
 
 class RequestMetaResponse(BaseModel):
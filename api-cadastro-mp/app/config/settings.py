@@ -21,6 +21,9 @@ class Settings(BaseSettings):
     db_pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
     db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
 
+    # 🔵 Cache em processo das tabelas de referência (tipos/status)
+    reference_cache_check_seconds: int = int(os.getenv("REFERENCE_CACHE_CHECK_SECONDS", "60"))
+
     environment: str = "development"
     debug: bool = True
 
@@ -31,6 +34,30 @@ class Settings(BaseSettings):
     totvs_db_user: str | None = None
     totvs_db_password: str | None = None
 
+    # 🟢 Pool/timeouts do TOTVS
+    totvs_db_pool_size: int = int(os.getenv("TOTVS_DB_POOL_SIZE", "5"))
+    totvs_db_max_overflow: int = int(os.getenv("TOTVS_DB_MAX_OVERFLOW", "5"))
+    totvs_db_pool_timeout: int = int(os.getenv("TOTVS_DB_POOL_TIMEOUT", "10"))
+    totvs_db_pool_recycle: int = int(os.getenv("TOTVS_DB_POOL_RECYCLE", "1800"))
+    totvs_db_connect_timeout: int = int(os.getenv("TOTVS_DB_CONNECT_TIMEOUT", "5"))
+    totvs_db_query_timeout: int = int(os.getenv("TOTVS_DB_QUERY_TIMEOUT", "15"))
+    # chamadas simultâneas ao TOTVS por worker (executadas no tpool do eventlet)
+    totvs_max_concurrency: int = int(os.getenv("TOTVS_MAX_CONCURRENCY", "4"))
+
+    # 🟢 Circuit breaker do TOTVS
+    totvs_breaker_failure_threshold: int = int(os.getenv("TOTVS_BREAKER_FAILURE_THRESHOLD", "5"))
+    totvs_breaker_reset_seconds: int = int(os.getenv("TOTVS_BREAKER_RESET_SECONDS", "30"))
+
+    # 🟢 Leitura do TOTVS: live (direto no ERP) | mirror (espelho local tbTotvsProductMirror)
+    totvs_read_mode: str = os.getenv("TOTVS_READ_MODE", "live")
+    # espelho mais velho que isso (última sincronização) volta a ler do ERP
+    totvs_mirror_max_age_seconds: int = int(os.getenv("TOTVS_MIRROR_MAX_AGE_SECONDS", "3600"))
+
+    # 🟢 Cache das consultas TOTVS por código de produto
+    totvs_cache_ttl_seconds: int = int(os.getenv("TOTVS_CACHE_TTL_SECONDS", "300"))
+    totvs_cache_negative_ttl_seconds: int = int(os.getenv("TOTVS_CACHE_NEGATIVE_TTL_SECONDS", "60"))
+    totvs_cache_max_entries: int = int(os.getenv("TOTVS_CACHE_MAX_ENTRIES", "2048"))
+
     jwt_secret: str = os.getenv("JWT_SECRET", "dev-secret-change-me")
     jwt_access_minutes: int = int(os.getenv("JWT_ACCESS_MINUTES", "60"))
 
@@ -40,6 +67,41 @@ class Settings(BaseSettings):
         os.getenv("JWT_REFRESH_MINUTES", str(60 * 24 * 7))
     )
 
+    # 🔐 Hash de senha (PBKDF2) fora do event loop: cálculos simultâneos por
+    # worker e tempo máximo na fila antes de recusar
+    password_hash_max_concurrency: int = int(os.getenv("PASSWORD_HASH_MAX_CONCURRENCY", "2"))
+    password_hash_queue_timeout_seconds: int = int(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", "10"))
+
+    # 🔐 Algoritmo/custo de hash de senha (hashes antigos são refeitos no login)
+    # custos sugeridos: python scripts/calibrate_password_hash.py --target-ms 250
+    password_hash_algo: str = os.getenv("PASSWORD_HASH_ALGO", "pbkdf2_sha256")
+    password_pbkdf2_iterations: int = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "600000"))
+    password_scrypt_n: int = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 15)))
+    password_scrypt_r: int = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+    password_scrypt_p: int = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+    # teto de memória por hash scrypt (128 * N * r) usado pela calibração
+    password_scrypt_max_memory_mb: int = int(os.getenv("PASSWORD_SCRYPT_MAX_MEMORY_MB", "64"))
+
+    # 🔐 LRU de tokens já verificados (JwtProvider.decode); 0 desliga
+    jwt_verified_cache_size: int = int(os.getenv("JWT_VERIFIED_CACHE_SIZE", "2048"))
+
+    # 🔐 Cache de tokens revogados: intervalo do delta sync (LISTEN/NOTIFY cobre o resto)
+    revoked_tokens_sync_seconds: int = int(os.getenv("REVOKED_TOKENS_SYNC_SECONDS", "30"))
+    # recarga completa periódica (revogação que commitou atrás da marca d'água)
+    revoked_tokens_full_sync_seconds: int = int(os.getenv("REVOKED_TOKENS_FULL_SYNC_SECONDS", "600"))
+
+    # 🟣 Socket.IO entre workers/containers: vazio (só memória, 1 worker),
+    # "postgres" (LISTEN/NOTIFY) ou URL de broker (redis://, amqp://, memory://)
+    socketio_message_queue: str | None = os.getenv("SOCKETIO_MESSAGE_QUEUE")
+    socketio_channel: str = os.getenv("SOCKETIO_CHANNEL", "controle_mp_socketio")
+    # eventos emitidos após o commit por uma green thread, em lotes deste tamanho
+    realtime_dispatch_batch_size: int = int(os.getenv("REALTIME_DISPATCH_BATCH_SIZE", "50"))
+    # conversation:join: acesso (user, conversa) cacheado por este tempo
+    socket_join_access_ttl_seconds: int = int(os.getenv("SOCKET_JOIN_ACCESS_TTL_SECONDS", "60"))
+    socket_join_access_max_entries: int = int(os.getenv("SOCKET_JOIN_ACCESS_MAX_ENTRIES", "10000"))
+    # janela de coalescência (mesmo request/rooms vira um evento só); 0 desliga
+    realtime_coalesce_ms: int = int(os.getenv("REALTIME_COALESCE_MS", "150"))
+
     files_storage_type: str = os.getenv("FILES_STORAGE_TYPE", "local")
     files_base_path: str = os.getenv("FILES_BASE_PATH", "./_uploads")
     max_file_size_mb: int = int(os.getenv("MAX_FILE_SIZE_MB", "20"))
@@ -49,6 +111,11 @@ class Settings(BaseSettings):
     central_jwt_issuer: str | None = os.getenv("CENTRAL_JWT_ISSUER")
     central_jwt_audience: str = os.getenv("CENTRAL_JWT_AUDIENCE", "delpi-central")
     central_default_role_id: int = int(os.getenv("CENTRAL_DEFAULT_ROLE_ID", "3"))
+    # chaves JWKS em memória: TTL (refresh em background), intervalo mínimo
+    # entre buscas por kid desconhecido e timeout da requisição ao Keycloak
+    central_jwks_ttl_seconds: int = int(os.getenv("CENTRAL_JWKS_TTL_SECONDS", "3600"))
+    central_jwks_min_refetch_seconds: int = int(os.getenv("CENTRAL_JWKS_MIN_REFETCH_SECONDS", "30"))
+    central_jwks_timeout_seconds: int = int(os.getenv("CENTRAL_JWKS_TIMEOUT_SECONDS", "5"))
 
     # ✅ Whitelist de tipos permitidos
     allowed_mime_types_raw: str = os.getenv(
@@ -87,7 +154,10 @@ class Settings(BaseSettings):
         "totvs_db_name",
         "totvs_db_user",
         "totvs_db_password",
+        "totvs_read_mode",
         "jwt_secret",
+        "password_hash_algo",
+        "socketio_message_queue",
         "jwt_issuer",
         "jwt_audience",
         "files_storage_type",
@@ -24,7 +24,21 @@ class MessageCreatedEvent:
     message_type_id: int | None = None
     message_type_code: str | None = None
 
+    # dono da conversa (define quem recebe o evento)
+    conversation_owner_id: int | None = None
+
 
 class MessageNotifier(Protocol):
+    def has_audience(self, *, conversation_id: int, conversation_owner_id: int | None) -> bool:
+        """False quando ninguém conectado receberia o evento (pula montar payload)."""
+        ...
+
     def notify_message_created(self, event: MessageCreatedEvent) -> None:
         ...
+
+    def notify_messages_read(self, *, conversation_id: int, user_id: int, last_read_message_id: int) -> None:
+        ...
+
+    def notify_unread_changed(self, *, conversation_id: int, unread_counts: dict[int, int]) -> None:
+        """unread_counts: {user_id: unread_count} já atualizados no banco."""
+        ...
@@ -15,6 +15,10 @@ class RequestCreatedEvent:
 
     # ✅ NOVO
     request: dict[str, Any] | None = None
+    version: int = 0
+
+    # dono da conversa (define quem recebe o evento)
+    conversation_owner_id: int | None = None
 
 
 @dataclass(frozen=True)
@@ -33,8 +37,19 @@ class RequestItemChangedEvent:
     request: dict[str, Any] | None = None
     item: dict[str, Any] | None = None
 
+    conversation_owner_id: int | None = None
+
+    # ✅ delta: versão do request + só o que mudou (sem o grafo completo)
+    version: int | None = None
+    request_owner_id: int | None = None
+    changes: dict[str, Any] | None = None
+
 
 class RequestNotifier(Protocol):
+    def has_audience(self, *, conversation_id: int, conversation_owner_id: int | None) -> bool:
+        """False quando ninguém conectado receberia o evento (pula montar payload)."""
+        ...
+
     def notify_request_created(self, event: RequestCreatedEvent) -> None:
         ...
 
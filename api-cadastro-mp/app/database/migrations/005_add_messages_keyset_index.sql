@@ -0,0 +1,9 @@
+BEGIN;
+
+-- tbMessages
+-- paginação keyset: WHERE conversation_id = ? AND id < ? ORDER BY id DESC LIMIT ?
+CREATE INDEX IF NOT EXISTS ix_msg_conversation_id_keyset
+    ON "tbMessages"(conversation_id, id)
+WHERE is_deleted = FALSE;
+
+COMMIT;
@@ -0,0 +1,10 @@
+BEGIN;
+
+-- tbRequestItem
+-- listagem (GET /requests/items): ORDER BY coalesce(updated_at, created_at) DESC, id DESC
+-- também atende a paginação keyset por (coalesce(updated_at, created_at), id)
+CREATE INDEX IF NOT EXISTS ix_ritem_last_activity
+    ON "tbRequestItem"((COALESCE(updated_at, created_at)) DESC, id DESC)
+WHERE is_deleted = FALSE;
+
+COMMIT;
@@ -0,0 +1,33 @@
+BEGIN;
+
+-- Espelho local do TOTVS (SB1010 + fornecedores SA5010)
+-- mesmas colunas selecionadas por TotvsProductRepository
+CREATE TABLE IF NOT EXISTS "tbTotvsProductMirror" (
+    codigo VARCHAR(30) PRIMARY KEY,
+    grupo VARCHAR(10),
+    tipo VARCHAR(10),
+    descricao VARCHAR(255),
+    armazem_padrao VARCHAR(10),
+    unidade VARCHAR(10),
+    produto_terceiro VARCHAR(10),
+    cta_contabil VARCHAR(30),
+    ref_cliente VARCHAR(100),
+    -- JSON (FOR JSON PATH) como veio do TOTVS
+    fornecedores TEXT,
+    totvs_recno BIGINT NOT NULL,
+    synced_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    is_deleted BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE INDEX IF NOT EXISTS ix_totvs_mirror_recno
+    ON "tbTotvsProductMirror"(totvs_recno);
+
+-- Marca d'água da sincronização incremental (por R_E_C_N_O_)
+CREATE TABLE IF NOT EXISTS "tbTotvsSyncState" (
+    sync_name VARCHAR(50) PRIMARY KEY,
+    last_sb1_recno BIGINT NOT NULL DEFAULT 0,
+    last_sa5_recno BIGINT NOT NULL DEFAULT 0,
+    last_synced_at TIMESTAMPTZ
+);
+
+COMMIT;
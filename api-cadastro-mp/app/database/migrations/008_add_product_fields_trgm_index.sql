@@ -0,0 +1,12 @@
+BEGIN;
+
+-- Busca de produtos (ILIKE '%q%' / similarity) em codigo_atual e descricao
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- tbProductFields
+-- GIN trigram somente para as tags pesquisáveis (índice pequeno)
+CREATE INDEX IF NOT EXISTS ix_pfields_search_value_trgm
+    ON "tbProductFields" USING GIN (field_value gin_trgm_ops)
+WHERE field_tag IN ('codigo_atual', 'descricao') AND is_deleted = FALSE;
+
+COMMIT;
@@ -0,0 +1,60 @@
+BEGIN;
+
+-- Resumo desnormalizado por produto (listagem/filtros em um único scan)
+-- mantido pela aplicação (ProductRepository.refresh_summary) na mesma transação
+CREATE TABLE IF NOT EXISTS "tbProductSummary" (
+    product_id BIGINT PRIMARY KEY,
+    codigo_atual TEXT,
+    descricao TEXT,
+    flags_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ,
+    last_activity TIMESTAMPTZ NOT NULL,
+    is_deleted BOOLEAN NOT NULL DEFAULT FALSE,
+    CONSTRAINT fk_psummary_product
+        FOREIGN KEY (product_id) REFERENCES "tbProduct"(id)
+);
+
+-- ordenação padrão: mais recente primeiro
+CREATE INDEX IF NOT EXISTS ix_psummary_last_activity
+    ON "tbProductSummary"(last_activity DESC, product_id DESC)
+WHERE is_deleted = FALSE;
+
+-- filtro flag=with
+CREATE INDEX IF NOT EXISTS ix_psummary_flagged_last_activity
+    ON "tbProductSummary"(last_activity DESC, product_id DESC)
+WHERE is_deleted = FALSE AND flags_count > 0;
+
+-- busca por texto (ILIKE/similarity)
+CREATE INDEX IF NOT EXISTS ix_psummary_search_trgm
+    ON "tbProductSummary" USING GIN (codigo_atual gin_trgm_ops, descricao gin_trgm_ops)
+WHERE is_deleted = FALSE;
+
+-- a busca passou a ler tbProductSummary: o trigram de tbProductFields (008)
+-- não é mais usado por nenhuma consulta e só encarece insert/update de campos
+DROP INDEX IF EXISTS ix_pfields_search_value_trgm;
+
+-- carga inicial
+INSERT INTO "tbProductSummary" (
+    product_id, codigo_atual, descricao, flags_count,
+    created_at, updated_at, last_activity, is_deleted
+)
+SELECT
+    p.id,
+    (SELECT f.field_value FROM "tbProductFields" f
+      WHERE f.product_id = p.id AND f.field_tag = 'codigo_atual' AND f.is_deleted = FALSE
+      LIMIT 1),
+    (SELECT f.field_value FROM "tbProductFields" f
+      WHERE f.product_id = p.id AND f.field_tag = 'descricao' AND f.is_deleted = FALSE
+      LIMIT 1),
+    (SELECT count(*) FROM "tbProductFields" f
+      WHERE f.product_id = p.id AND f.is_deleted = FALSE
+        AND f.field_flag IS NOT NULL AND f.field_flag <> ''),
+    p.created_at,
+    p.updated_at,
+    COALESCE(p.updated_at, p.created_at),
+    COALESCE(p.is_deleted, FALSE)
+FROM "tbProduct" p
+ON CONFLICT (product_id) DO NOTHING;
+
+COMMIT;
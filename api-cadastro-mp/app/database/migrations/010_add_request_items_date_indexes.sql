@@ -0,0 +1,15 @@
+BEGIN;
+
+-- tbRequestItem
+-- filtros de data (GET /requests/items?date_mode=CREATED|UPDATED) em faixa semiaberta:
+--   created_at >= :inicio AND created_at < :fim
+-- (date_mode=AUTO usa ix_ritem_last_activity)
+CREATE INDEX IF NOT EXISTS ix_ritem_created_at
+    ON "tbRequestItem"(created_at DESC, id DESC)
+WHERE is_deleted = FALSE;
+
+CREATE INDEX IF NOT EXISTS ix_ritem_updated_at
+    ON "tbRequestItem"(updated_at DESC, id DESC)
+WHERE is_deleted = FALSE;
+
+COMMIT;
@@ -0,0 +1,15 @@
+BEGIN;
+
+-- Fila do Socket.IO entre workers (SOCKETIO_MESSAGE_QUEUE=postgres)
+-- mensagens pequenas vão direto no NOTIFY; as maiores que o limite
+-- do payload (8000 bytes) ficam aqui e o NOTIFY leva só o id
+CREATE TABLE IF NOT EXISTS "tbSocketioMessages" (
+    id BIGSERIAL PRIMARY KEY,
+    payload TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_socketio_messages_created_at
+    ON "tbSocketioMessages"(created_at);
+
+COMMIT;
@@ -0,0 +1,9 @@
+BEGIN;
+
+-- tbRequest.version
+-- incrementada a cada request:item_changed; o front detecta eventos perdidos
+-- (salto de versão) e pede um snapshot (request:resync)
+ALTER TABLE "tbRequest"
+    ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
+
+COMMIT;
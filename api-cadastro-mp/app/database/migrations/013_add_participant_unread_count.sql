@@ -0,0 +1,25 @@
+BEGIN;
+
+-- tbConversationParticipants.unread_count
+-- contador de não lidas mantido pela aplicação (insert/delete de mensagem e
+-- set_last_read); /conversations/unread-summary vira uma leitura simples
+ALTER TABLE "tbConversationParticipants"
+    ADD COLUMN IF NOT EXISTS unread_count INTEGER NOT NULL DEFAULT 0;
+
+-- backfill: mesma regra da contagem antiga (depois da última lida, de outros remetentes)
+UPDATE "tbConversationParticipants" p
+SET unread_count = (
+    SELECT COUNT(*)
+    FROM "tbMessages" m
+    WHERE m.conversation_id = p.conversation_id
+      AND m.id > COALESCE(p.last_read_message_id, 0)
+      AND m.sender_id <> p.user_id
+      AND m.is_deleted = FALSE
+);
+
+-- resumo por usuário só olha quem tem pendência
+CREATE INDEX IF NOT EXISTS ix_participant_user_unread
+    ON "tbConversationParticipants"(user_id)
+WHERE unread_count > 0 AND is_deleted = FALSE;
+
+COMMIT;
@@ -0,0 +1,149 @@
+# app/infrastructure/cache/reference_cache.py
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.infrastructure.database.models.message_type_model import MessageTypeModel
+from app.infrastructure.database.models.request_status_model import RequestStatusModel
+from app.infrastructure.database.models.request_type_model import RequestTypeModel
+
+
+@dataclass(frozen=True)
+class CachedRequestType:
+    id: int
+    type_name: str
+
+
+@dataclass(frozen=True)
+class CachedRequestStatus:
+    id: int
+    status_name: str
+
+
+@dataclass(frozen=True)
+class CachedMessageType:
+    id: int
+    code: str
+    description: str | None
+
+
+# Fingerprint barato das tabelas de referência:
+# count(*) + maior xmin muda em qualquer INSERT/UPDATE/DELETE.
+_VERSION_SQL = text(
+    """
+    SELECT
+        (SELECT count(*) || ':' || coalesce(max(xmin::text::bigint), 0) FROM "tbRequestType")
+        || '|' ||
+        (SELECT count(*) || ':' || coalesce(max(xmin::text::bigint), 0) FROM "tbRequestStatus")
+        || '|' ||
+        (SELECT count(*) || ':' || coalesce(max(xmin::text::bigint), 0) FROM "tbMessageTypes")
+    """
+)
+
+
+class ReferenceCache:
+    """
+    Cache em processo das tabelas de referência (seed):
+    tbRequestType, tbRequestStatus e tbMessageTypes.
+
+    - Aquecido no startup (warm) ou no primeiro uso.
+    - A cada `check_seconds` roda um SELECT de versão; se mudou, recarrega tudo.
+    - Guarda snapshots imutáveis (não instâncias ORM), seguros entre sessões/threads.
+    """
+
+    def __init__(self, *, check_seconds: int) -> None:
+        self._check_seconds = max(0, int(check_seconds))
+        self._lock = threading.Lock()
+
+        self._version: str | None = None
+        self._checked_at: float = 0.0
+
+        self._request_types: dict[int, CachedRequestType] = {}
+        self._request_statuses: dict[int, CachedRequestStatus] = {}
+        self._message_types: dict[int, CachedMessageType] = {}
+        self._message_type_ids_by_code: dict[str, int] = {}
+
+    # ---------------- ciclo de vida ----------------
+    def warm(self, session: Session) -> None:
+        version = self._read_version(session)
+
+        request_types = {
+            int(r.id): CachedRequestType(id=int(r.id), type_name=str(r.type_name))
+            for r in session.execute(
+                select(RequestTypeModel).where(RequestTypeModel.is_deleted.is_(False))
+            ).scalars()
+        }
+        request_statuses = {
+            int(r.id): CachedRequestStatus(id=int(r.id), status_name=str(r.status_name))
+            for r in session.execute(
+                select(RequestStatusModel).where(RequestStatusModel.is_deleted.is_(False))
+            ).scalars()
+        }
+        message_types = {
+            int(r.id): CachedMessageType(id=int(r.id), code=str(r.code), description=r.description)
+            for r in session.execute(
+                select(MessageTypeModel).where(MessageTypeModel.is_deleted.is_(False))
+            ).scalars()
+        }
+
+        with self._lock:
+            self._request_types = request_types
+            self._request_statuses = request_statuses
+            self._message_types = message_types
+            self._message_type_ids_by_code = {t.code: t.id for t in message_types.values()}
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+            self._checked_at = 0.0
+
+    def _read_version(self, session: Session) -> str:
+        return str(session.execute(_VERSION_SQL).scalar_one())
+
+    def _ensure_fresh(self, session: Session) -> None:
+        with self._lock:
+            version = self._version
+            due = (time.monotonic() - self._checked_at) >= self._check_seconds
+
+        if version is None:
+            self.warm(session)
+            return
+
+        if not due:
+            return
+
+        if self._read_version(session) != version:
+            self.warm(session)
+            return
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+
+    # ---------------- leitura ----------------
+    def request_types(self, session: Session) -> dict[int, CachedRequestType]:
+        self._ensure_fresh(session)
+        return self._request_types
+
+    def request_statuses(self, session: Session) -> dict[int, CachedRequestStatus]:
+        self._ensure_fresh(session)
+        return self._request_statuses
+
+    def message_type_id_by_code(self, session: Session, code: str) -> int | None:
+        self._ensure_fresh(session)
+        return self._message_type_ids_by_code.get(code)
+
+    def message_type_code_by_id(self, session: Session, message_type_id: int) -> str | None:
+        self._ensure_fresh(session)
+        t = self._message_types.get(int(message_type_id))
+        return t.code if t is not None else None
+
+
+reference_cache = ReferenceCache(check_seconds=settings.reference_cache_check_seconds)
@@ -0,0 +1,173 @@
+# app/infrastructure/cache/revoked_token_cache.py
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+
+import eventlet
+import psycopg2
+from eventlet.hubs import trampoline
+
+from app.config.settings import settings
+from app.infrastructure.database.session import db_session
+from app.repositories.revoked_token_repository import (
+    REVOKED_TOKENS_CHANNEL,
+    RevokedTokenRepository,
+)
+
+
+# ids relidos atrás da marca d'água a cada delta sync
+_WATERMARK_SAFETY_IDS = 1000
+
+
+def _to_ts(dt: datetime) -> float:
+    # tbRevokedTokens grava expires_at em UTC "naive"
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class RevokedTokenCache:
+    """
+    Conjunto em memória de jti revogados (cada um válido até o `exp` do token).
+
+    - Delta sync: a cada `sync_seconds` busca em tbRevokedTokens os ids novos,
+      relendo uma janela atrás da marca d'água (id é atribuído no INSERT, não no
+      commit: uma transação lenta pode commitar um id menor depois).
+    - Recarga completa a cada `full_sync_seconds` e a cada (re)conexão do LISTEN,
+      que cobre NOTIFY perdidos fora da janela.
+    - LISTEN/NOTIFY: logout em qualquer worker publica no canal e todos os
+      processos adicionam o jti na hora.
+    Caso comum (token não revogado) não vai ao banco.
+    """
+
+    def __init__(self, *, sync_seconds: int, full_sync_seconds: int) -> None:
+        self._sync_seconds = max(1, int(sync_seconds))
+        self._full_sync_seconds = max(self._sync_seconds, int(full_sync_seconds))
+        self._lock = threading.Lock()
+
+        self._revoked: dict[str, float] = {}  # jti -> exp (unix)
+        self._last_id = 0
+        self._synced_at: float | None = None
+        self._full_synced_at: float | None = None
+        self._syncing = False
+        self._listener_started = False
+
+    # ---------------- leitura ----------------
+    def is_revoked(self, jti: str) -> bool:
+        self._maybe_sync()
+        exp = self._revoked.get(str(jti))
+        return exp is not None and exp > time.time()
+
+    # ---------------- escrita ----------------
+    def add(self, jti: str, exp_ts: float) -> None:
+        with self._lock:
+            self._revoked[str(jti)] = float(exp_ts)
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        with self._lock:
+            for jti in [k for k, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[jti]
+
+    # ---------------- delta sync ----------------
+    def _maybe_sync(self) -> None:
+        synced_at = self._synced_at
+        if synced_at is not None and (time.monotonic() - synced_at) < self._sync_seconds:
+            return
+
+        # uma green thread sincroniza; as demais seguem com o conjunto atual
+        with self._lock:
+            if self._syncing and synced_at is not None:
+                return
+            self._syncing = True
+
+        full_synced_at = self._full_synced_at
+        full = full_synced_at is None or (time.monotonic() - full_synced_at) >= self._full_sync_seconds
+
+        try:
+            self.sync(full=full)
+        except Exception:
+            # nunca carregou: não dá para responder com segurança
+            if synced_at is None:
+                raise
+        finally:
+            with self._lock:
+                self._syncing = False
+
+    def sync(self, *, full: bool = False) -> None:
+        after_id = 0 if full else max(0, self._last_id - _WATERMARK_SAFETY_IDS)
+        with db_session() as session:
+            rows = RevokedTokenRepository(session).list_active_since(
+                after_id=after_id,
+                now=datetime.utcnow(),
+            )
+
+        with self._lock:
+            for row_id, jti, expires_at in rows:
+                self._revoked[str(jti)] = _to_ts(expires_at)
+                self._last_id = max(self._last_id, int(row_id))
+            self._synced_at = time.monotonic()
+            if full:
+                self._full_synced_at = self._synced_at
+
+        self._purge_expired()
+
+    # ---------------- LISTEN/NOTIFY ----------------
+    def start_listener(self) -> None:
+        """Inicia (uma vez por processo) a green thread que escuta o canal de revogação."""
+        with self._lock:
+            if self._listener_started:
+                return
+            self._listener_started = True
+
+        eventlet.spawn(self._listen_forever)
+
+    def _listen_forever(self) -> None:
+        while True:
+            try:
+                self._listen_once()
+            except Exception:
+                # banco indisponível: o delta sync segue cobrindo; tenta reconectar
+                eventlet.sleep(5)
+
+    def _listen_once(self) -> None:
+        conn = psycopg2.connect(
+            host=settings.db_host,
+            port=settings.db_port,
+            dbname=settings.db_name,
+            user=settings.db_user,
+            password=settings.db_password,
+            sslmode="require" if settings.db_ssl else "prefer",
+            connect_timeout=10,
+        )
+        try:
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {REVOKED_TOKENS_CHANNEL};")
+
+            # NOTIFY enviados enquanto a escuta estava fora não voltam: recarrega tudo
+            self.sync(full=True)
+
+            while True:
+                # espera no hub pelo socket da conexão (não bloqueia o worker)
+                try:
+                    trampoline(conn.fileno(), read=True, timeout=60)
+                except eventlet.timeout.Timeout:
+                    continue
+
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    jti, _, exp = (notify.payload or "").partition("|")
+                    if jti and exp:
+                        self.add(jti, float(exp))
+        finally:
+            conn.close()
+
+
+revoked_token_cache = RevokedTokenCache(
+    sync_seconds=settings.revoked_tokens_sync_seconds,
+    full_sync_seconds=settings.revoked_tokens_full_sync_seconds,
+)
@@ -0,0 +1,91 @@
+# app/infrastructure/cache/ttl_lru_cache.py
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TtlLruCache:
+    """
+    Cache em processo com expiração (TTL) + limite de entradas (LRU).
+
+    - Valores "vazios" (ex.: código inexistente) são cacheados com `negative_ttl_seconds`.
+    - get/set trabalham com cópias, para o chamador poder mutar o resultado livremente.
+    - Contadores de hit/miss expostos em `stats()`.
+    """
+
+    def __init__(self, *, max_entries: int, ttl_seconds: int, negative_ttl_seconds: int) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._ttl = max(0, int(ttl_seconds))
+        self._negative_ttl = max(0, int(negative_ttl_seconds))
+        self._lock = threading.Lock()
+
+        # key -> (expires_at, value)
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self._misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            value = entry[1]
+
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        ttl = self._ttl if value else self._negative_ttl
+        if ttl <= 0:
+            return
+
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (expires_at, copy.deepcopy(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], *, fresh: bool = False) -> Any:
+        """
+        Read-through: devolve do cache ou chama `loader` e guarda o resultado.
+        Com fresh=True ignora o valor cacheado (mas atualiza o cache com o novo).
+        """
+        _missing = object()
+        if not fresh:
+            value = self.get(key, _missing)
+            if value is not _missing:
+                return value
+
+        value = loader()
+        self.set(key, value)
+        return copy.deepcopy(value)
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
@@ -0,0 +1,93 @@
+# app/infrastructure/database/circuit_breaker.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, TypeVar
+
+from app.core.exceptions import AppError, ConflictError
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker simples para dependências externas (ex.: TOTVS).
+
+    - CLOSED: chamadas passam; falhas consecutivas são contadas.
+    - OPEN: após `failure_threshold` falhas, rejeita na hora (ConflictError)
+      durante `reset_seconds`.
+    - HALF_OPEN: passado o tempo, deixa UMA chamada de teste passar;
+      sucesso fecha o circuito, falha reabre.
+
+    Erros de negócio (AppError) não contam como falha da dependência.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, *, name: str, failure_threshold: int, reset_seconds: int) -> None:
+        self._name = name
+        self._failure_threshold = max(1, int(failure_threshold))
+        self._reset_seconds = max(1, int(reset_seconds))
+        self._lock = threading.Lock()
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            if self._state == self.OPEN:
+                if (time.monotonic() - self._opened_at) < self._reset_seconds:
+                    raise ConflictError(
+                        f"{self._name} indisponível no momento. Tente novamente em instantes."
+                    )
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            # HALF_OPEN: só uma chamada de teste por vez
+            if self._trial_in_flight:
+                raise ConflictError(
+                    f"{self._name} indisponível no momento. Tente novamente em instantes."
+                )
+            self._trial_in_flight = True
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def _on_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, fn: Callable[[], T]) -> T:
+        self._before_call()
+        try:
+            result = fn()
+        except AppError:
+            with self._lock:
+                self._trial_in_flight = False
+            raise
+        except Exception:
+            self._on_failure()
+            raise
+
+        self._on_success()
+        return result
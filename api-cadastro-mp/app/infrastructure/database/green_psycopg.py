@@ -0,0 +1,33 @@
+# app/infrastructure/database/green_psycopg.py
+from __future__ import annotations
+
+import psycopg2
+from eventlet.hubs import trampoline
+from psycopg2 import extensions
+
+
+def _eventlet_wait_callback(conn, timeout=None) -> None:
+    # mesmo callback do psycogreen: cada espera do libpq vira um trampoline no hub
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        if state == extensions.POLL_READ:
+            trampoline(conn.fileno(), read=True)
+        elif state == extensions.POLL_WRITE:
+            trampoline(conn.fileno(), write=True)
+        else:
+            raise psycopg2.OperationalError(f"Resultado inesperado do poll: {state!r}")
+
+
+def patch_psycopg() -> None:
+    """
+    Torna o psycopg2 "verde" sob eventlet (connect, queries e LISTEN não travam o hub).
+    Usa o psycogreen se estiver instalado. Chamar uma vez, antes de abrir conexões.
+    """
+    try:
+        from psycogreen.eventlet import patch_psycopg as _patch
+    except ImportError:
+        extensions.set_wait_callback(_eventlet_wait_callback)
+        return
+    _patch()
@@ -17,3 +17,5 @@ from app.infrastructure.database.models.request_type_model import RequestTypeMod
 from app.infrastructure.database.models.field_type_model import FieldTypeModel  # noqa: F401
 from app.infrastructure.database.models.product_model import ProductModel  # noqa: F401
 from app.infrastructure.database.models.product_field_model import ProductFieldModel  # noqa: F401
+from app.infrastructure.database.models.totvs_product_mirror_model import TotvsProductMirrorModel, TotvsSyncStateModel  # noqa: F401
+from app.infrastructure.database.models.product_summary_model import ProductSummaryModel  # noqa: F401
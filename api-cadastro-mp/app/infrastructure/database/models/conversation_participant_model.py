@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.database.base_model import BaseModel
@@ -27,6 +27,9 @@ class ConversationParticipantModel(BaseModel):
 
     last_read_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # não lidas (mantido incrementalmente; ver ConversationParticipantRepository)
+    unread_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
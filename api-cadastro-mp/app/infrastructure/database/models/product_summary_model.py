@@ -0,0 +1,21 @@
+# app/infrastructure/database/models/product_summary_model.py
+
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Integer, Text
+from app.infrastructure.database.base_model import BaseModel
+
+
+class ProductSummaryModel(BaseModel):
+    """
+    Resumo desnormalizado de tbProduct + tbProductFields para a listagem.
+    Mantido por ProductRepository.refresh_summary (mesma transação da escrita).
+    """
+    __tablename__ = "tbProductSummary"
+
+    product_id = Column(BigInteger, ForeignKey("tbProduct.id"), primary_key=True)
+    codigo_atual = Column(Text, nullable=True)
+    descricao = Column(Text, nullable=True)
+    flags_count = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    last_activity = Column(DateTime(timezone=True), nullable=False)
+    is_deleted = Column(Boolean, nullable=False, server_default="false")
@@ -27,3 +27,6 @@ class RequestModel(BaseModel):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
 
     is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+
+    # versão para eventos realtime (request:item_changed)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
@@ -0,0 +1,40 @@
+# app/infrastructure/database/models/totvs_product_mirror_model.py
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database.base_model import BaseModel
+
+
+class TotvsProductMirrorModel(BaseModel):
+    __tablename__ = "tbTotvsProductMirror"
+
+    codigo: Mapped[str] = mapped_column(String(30), primary_key=True)
+
+    grupo: Mapped[str] = mapped_column(String(10), nullable=True)
+    tipo: Mapped[str] = mapped_column(String(10), nullable=True)
+    descricao: Mapped[str] = mapped_column(String(255), nullable=True)
+    armazem_padrao: Mapped[str] = mapped_column(String(10), nullable=True)
+    unidade: Mapped[str] = mapped_column(String(10), nullable=True)
+    produto_terceiro: Mapped[str] = mapped_column(String(10), nullable=True)
+    cta_contabil: Mapped[str] = mapped_column(String(30), nullable=True)
+    ref_cliente: Mapped[str] = mapped_column(String(100), nullable=True)
+
+    # JSON (FOR JSON PATH) como veio do TOTVS
+    fornecedores: Mapped[str] = mapped_column(Text, nullable=True)
+
+    totvs_recno: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
+
+
+class TotvsSyncStateModel(BaseModel):
+    __tablename__ = "tbTotvsSyncState"
+
+    sync_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    last_sb1_recno: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    last_sa5_recno: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    last_synced_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
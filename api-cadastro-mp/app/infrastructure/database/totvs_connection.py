@@ -1,13 +1,34 @@
 # app/infrastructure/database/totvs_connection.py
 from __future__ import annotations
 
+import threading
 from functools import lru_cache
+from typing import Callable, TypeVar
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from eventlet import patcher, tpool
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.config.settings import settings
 from app.core.exceptions import ConflictError
+from app.infrastructure.database.circuit_breaker import CircuitBreaker
+
+T = TypeVar("T")
+
+
+# ✅ falha rápido quando o TOTVS está fora/lento (não prende greenlets nem o pool do Postgres)
+totvs_breaker = CircuitBreaker(
+    name="TOTVS",
+    failure_threshold=settings.totvs_breaker_failure_threshold,
+    reset_seconds=settings.totvs_breaker_reset_seconds,
+)
+
+# ✅ limita chamadas simultâneas ao TOTVS (no máximo o tamanho do pool, para
+# as threads nativas do tpool não disputarem conexões entre si)
+_totvs_slots = threading.BoundedSemaphore(
+    max(1, min(settings.totvs_max_concurrency, settings.totvs_db_pool_size))
+)
 
 
 @lru_cache(maxsize=1)
@@ -28,8 +49,19 @@ def _get_totvs_sessionmaker() -> sessionmaker:
         url,
         pool_pre_ping=True,
         future=True,
+        pool_size=settings.totvs_db_pool_size,
+        max_overflow=settings.totvs_db_max_overflow,
+        pool_timeout=settings.totvs_db_pool_timeout,
+        pool_recycle=settings.totvs_db_pool_recycle,
+        # pyodbc: timeout de login (segundos)
+        connect_args={"timeout": settings.totvs_db_connect_timeout},
     )
 
+    @event.listens_for(engine, "connect")
+    def _set_query_timeout(dbapi_connection, connection_record):  # noqa: ARG001
+        # pyodbc: timeout por comando (segundos); 0 = sem limite
+        dbapi_connection.timeout = settings.totvs_db_query_timeout
+
     return sessionmaker(
         autocommit=False,
         autoflush=False,
@@ -44,3 +76,31 @@ def TotvsSessionLocal():
     """
     SessionLocal = _get_totvs_sessionmaker()
     return SessionLocal()
+
+
+def _offload(fn: Callable[[], T]) -> T:
+    """
+    pyodbc é extensão C: sob eventlet, uma query bloqueia o hub inteiro do worker.
+    Com monkey_patch ativo roda em thread nativa (eventlet.tpool); fora dele
+    (scripts/CLI) chama direto.
+    """
+    if patcher.is_monkey_patched("thread"):
+        return tpool.execute(fn)
+    return fn()
+
+
+def run_totvs(fn: Callable[[Session], T]) -> T:
+    """
+    Executa `fn(session)` no TOTVS passando pelo circuit breaker,
+    com concorrência limitada e fora do event loop.
+    Uso: rows = run_totvs(lambda session: session.execute(...).all())
+    """
+    def _call() -> T:
+        with TotvsSessionLocal() as session:
+            return fn(session)
+
+    def _guarded() -> T:
+        with _totvs_slots:
+            return _offload(_call)
+
+    return totvs_breaker.call(_guarded)
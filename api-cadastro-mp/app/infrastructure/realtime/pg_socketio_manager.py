@@ -0,0 +1,122 @@
+# app/infrastructure/realtime/pg_socketio_manager.py
+from __future__ import annotations
+
+import base64
+import pickle
+import select as _select
+import threading
+import time
+
+import psycopg2
+import socketio
+from sqlalchemy import text
+
+from app.config.settings import settings
+from app.infrastructure.database.session import db_session
+
+# limite do payload do NOTIFY é 8000 bytes; acima disso vai por tbSocketioMessages
+_NOTIFY_MAX_BYTES = 7000
+_LARGE_PREFIX = "@"
+
+# mensagens grandes só precisam viver até todos os workers lerem
+_LARGE_RETENTION_SECONDS = 300
+_PURGE_EVERY_SECONDS = 60
+
+
+class PostgresNotifyManager(socketio.PubSubManager):
+    """
+    Client manager do Socket.IO sobre PostgreSQL LISTEN/NOTIFY.
+
+    Cada worker publica emits/rooms no canal e escuta o mesmo canal, então um
+    evento emitido em um worker chega aos clientes conectados nos demais.
+    Usa o banco que a aplicação já tem (sem Redis/RabbitMQ).
+    """
+
+    name = "postgres"
+
+    def __init__(self, *, channel: str, write_only: bool = False, logger=None) -> None:
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self._purge_lock = threading.Lock()
+        self._purged_at = 0.0
+
+    # ---------------- publicação ----------------
+    def _publish(self, data) -> None:
+        payload = base64.b64encode(pickle.dumps(data)).decode("ascii")
+
+        with db_session() as session:
+            if len(payload) > _NOTIFY_MAX_BYTES:
+                message_id = session.execute(
+                    text('INSERT INTO "tbSocketioMessages" (payload) VALUES (:p) RETURNING id'),
+                    {"p": payload},
+                ).scalar_one()
+                payload = f"{_LARGE_PREFIX}{message_id}"
+
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+
+        self._maybe_purge()
+
+    def _maybe_purge(self) -> None:
+        with self._purge_lock:
+            if (time.monotonic() - self._purged_at) < _PURGE_EVERY_SECONDS:
+                return
+            self._purged_at = time.monotonic()
+
+        with db_session() as session:
+            session.execute(
+                text(
+                    'DELETE FROM "tbSocketioMessages" '
+                    "WHERE created_at < now() - make_interval(secs => :secs)"
+                ),
+                {"secs": _LARGE_RETENTION_SECONDS},
+            )
+
+    # ---------------- escuta ----------------
+    def _listen(self):
+        while True:
+            try:
+                yield from self._listen_once()
+            except Exception:
+                self._get_logger().exception("Socket.IO postgres: escuta caiu, reconectando")
+                time.sleep(5)
+
+    def _listen_once(self):
+        conn = psycopg2.connect(
+            host=settings.db_host,
+            port=settings.db_port,
+            dbname=settings.db_name,
+            user=settings.db_user,
+            password=settings.db_password,
+            sslmode="require" if settings.db_ssl else "prefer",
+            connect_timeout=10,
+        )
+        try:
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f'LISTEN "{self.channel}";')
+
+            while True:
+                # select "verde" (monkey_patch): não bloqueia o hub
+                ready, _, _ = _select.select([conn], [], [], 60)
+                if not ready:
+                    continue
+
+                conn.poll()
+                while conn.notifies:
+                    payload = conn.notifies.pop(0).payload or ""
+                    if payload.startswith(_LARGE_PREFIX):
+                        payload = self._read_large(conn, int(payload[len(_LARGE_PREFIX):]))
+                        if payload is None:
+                            continue
+                    yield base64.b64decode(payload)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _read_large(conn, message_id: int) -> str | None:
+        with conn.cursor() as cur:
+            cur.execute('SELECT payload FROM "tbSocketioMessages" WHERE id = %s', (message_id,))
+            row = cur.fetchone()
+        return row[0] if row else None
@@ -0,0 +1,164 @@
+# app/infrastructure/realtime/realtime_dispatcher.py
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Hashable
+
+import eventlet
+from eventlet.queue import Empty, LightQueue
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.infrastructure.realtime.socketio_server import socketio
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "realtime_pending"
+
+# (payload_anterior, payload_novo) -> payload consolidado
+Merger = Callable[[dict[str, Any], dict[str, Any]], dict[str, Any]]
+
+
+class RealtimeDispatcher:
+    """
+    Emits do Socket.IO só depois do commit, fora da requisição.
+
+    - emit_after_commit(session, ...) guarda o evento em session.info;
+    - after_commit: os eventos vão para a fila; rollback: são descartados
+      (cliente nunca vê evento de transação desfeita);
+    - uma green thread esvazia a fila em lotes de `batch_size`, então a
+      resposta HTTP não espera o fan-out;
+    - eventos com `coalesce_key` (ex.: mesmo request) para as mesmas rooms
+      são segurados por `coalesce_seconds` e saem como um só, combinados
+      pelo merger registrado para o evento.
+    """
+
+    def __init__(self, *, batch_size: int, coalesce_seconds: float) -> None:
+        self._batch_size = max(1, int(batch_size))
+        self._coalesce_seconds = max(0.0, float(coalesce_seconds))
+        self._queue: LightQueue = LightQueue()
+        self._lock = threading.Lock()
+        self._worker_started = False
+
+        self._mergers: dict[str, Merger] = {}
+        # (evento, rooms, coalesce_key) -> payload acumulado na janela
+        self._coalescing: dict[tuple, dict[str, Any]] = {}
+        self._coalesced_total = 0
+
+    def register_merger(self, event_name: str, merger: Merger) -> None:
+        self._mergers[event_name] = merger
+
+    # ---------------- enfileiramento ----------------
+    def emit_after_commit(
+        self,
+        session: Session | None,
+        event_name: str,
+        payload: dict[str, Any],
+        *,
+        to: str | list[str] | None = None,
+        coalesce_key: Hashable | None = None,
+    ) -> None:
+        item = (event_name, payload, to, coalesce_key)
+        if session is None:
+            # sem transação associada: só tira o fan-out da requisição
+            self._enqueue([item])
+            return
+        session.info.setdefault(_PENDING_KEY, []).append(item)
+
+    def _on_commit(self, session: Session) -> None:
+        pending = session.info.pop(_PENDING_KEY, None)
+        if pending:
+            self._enqueue(pending)
+
+    def _on_rollback(self, session: Session, previous_transaction) -> None:
+        # só o rollback da transação externa descarta (savepoint não)
+        if previous_transaction.parent is None:
+            session.info.pop(_PENDING_KEY, None)
+
+    def _enqueue(self, items: list[tuple]) -> None:
+        self._ensure_worker()
+        for item in items:
+            self._queue.put(item)
+
+    # ---------------- envio ----------------
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._worker_started:
+                return
+            self._worker_started = True
+
+        eventlet.spawn(self._run_forever)
+
+    def _run_forever(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            for event_name, payload, to, coalesce_key in batch:
+                if coalesce_key is not None and self._coalesce(event_name, payload, to, coalesce_key):
+                    continue
+                self._emit(event_name, payload, to)
+
+            # devolve o hub para as requisições entre lotes
+            eventlet.sleep(0)
+
+    def _emit(self, event_name: str, payload: dict[str, Any], to) -> None:
+        try:
+            socketio.emit(event_name, payload, to=to)
+        except Exception:
+            logger.exception("Falha ao emitir evento realtime %s", event_name)
+
+    # ---------------- coalescência ----------------
+    def _coalesce(self, event_name: str, payload: dict[str, Any], to, coalesce_key: Hashable) -> bool:
+        """Guarda/combina o evento na janela. False = emitir direto."""
+        merger = self._mergers.get(event_name)
+        if merger is None or self._coalesce_seconds <= 0:
+            return False
+
+        rooms = tuple(to) if isinstance(to, (list, tuple)) else to
+        key = (event_name, rooms, coalesce_key)
+
+        with self._lock:
+            previous = self._coalescing.get(key)
+            if previous is not None:
+                self._coalescing[key] = merger(previous, payload)
+                self._coalesced_total += 1
+                return True
+            self._coalescing[key] = payload
+
+        # primeiro evento da janela: agenda o envio consolidado
+        eventlet.spawn_after(self._coalesce_seconds, self._flush, key, to)
+        return True
+
+    def _flush(self, key: tuple, to) -> None:
+        with self._lock:
+            payload = self._coalescing.pop(key, None)
+        if payload is not None:
+            self._emit(key[0], payload, to)
+
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "coalescing": len(self._coalescing),
+                "coalesced_total": self._coalesced_total,
+            }
+
+
+realtime_dispatcher = RealtimeDispatcher(
+    batch_size=settings.realtime_dispatch_batch_size,
+    coalesce_seconds=settings.realtime_coalesce_ms / 1000,
+)
+
+# vale para toda Session (db_session e scripts)
+event.listen(Session, "after_commit", realtime_dispatcher._on_commit)
+event.listen(Session, "after_soft_rollback", realtime_dispatcher._on_rollback)
@@ -0,0 +1,32 @@
+# app/infrastructure/realtime/rooms.py
+from __future__ import annotations
+
+# rooms por papel: ADMIN=1, ANALYST=2, USER=3
+_ROLE_ROOMS = {1: "role:admin", 2: "role:analyst", 3: "role:user"}
+
+# ADMIN/ANALYST enxergam todas as conversas
+PRIVILEGED_ROOMS = (_ROLE_ROOMS[1], _ROLE_ROOMS[2])
+
+
+def user_room(user_id: int) -> str:
+    return f"user:{int(user_id)}"
+
+
+def role_room(role_id: int) -> str | None:
+    return _ROLE_ROOMS.get(int(role_id))
+
+
+def conversation_room(conversation_id: int) -> str:
+    return f"conversation:{int(conversation_id)}"
+
+
+def conversation_audience(conversation_id: int, owner_id: int | None) -> list[str]:
+    """
+    Quem pode ver a conversa (mesma regra do _can_access dos services):
+    ADMIN/ANALYST + o dono. A room da conversa continua para quem deu join.
+    O Socket.IO entrega uma vez por cliente mesmo que ele esteja em várias rooms.
+    """
+    rooms = [conversation_room(conversation_id), *PRIVILEGED_ROOMS]
+    if owner_id is not None:
+        rooms.append(user_room(owner_id))
+    return rooms
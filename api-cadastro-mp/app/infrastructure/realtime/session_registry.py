@@ -0,0 +1,115 @@
+# app/infrastructure/realtime/session_registry.py
+from __future__ import annotations
+
+import threading
+from typing import Callable, Iterable
+
+from app.config.settings import settings
+from app.infrastructure.cache.ttl_lru_cache import TtlLruCache
+
+
+class SocketSessionRegistry:
+    """
+    Sessões Socket.IO deste worker: user_id -> sids e sid -> rooms.
+
+    - has_listeners(rooms): alguém conectado em alguma das rooms? Os services
+      usam para nem montar o payload quando ninguém vai receber. Com fila
+      entre workers (SOCKETIO_MESSAGE_QUEUE) o ouvinte pode estar em outro
+      processo, então responde sempre True.
+    - can_join_conversation: resultado do check de acesso cacheado por
+      (user_id, conversation_id) durante `access_ttl_seconds`.
+    """
+
+    def __init__(self, *, access_ttl_seconds: int, access_max_entries: int) -> None:
+        self._lock = threading.Lock()
+        self._sids_by_user: dict[int, set[str]] = {}
+        self._user_by_sid: dict[str, int] = {}
+        self._role_by_sid: dict[str, int | None] = {}
+        self._rooms_by_sid: dict[str, set[str]] = {}
+        self._room_counts: dict[str, int] = {}
+
+        self._access_cache = TtlLruCache(
+            max_entries=access_max_entries,
+            ttl_seconds=access_ttl_seconds,
+            negative_ttl_seconds=access_ttl_seconds,
+        )
+
+    # ---------------- sessões ----------------
+    def connect(self, sid: str, *, user_id: int, role_id: int | None) -> None:
+        with self._lock:
+            self._user_by_sid[sid] = int(user_id)
+            self._role_by_sid[sid] = role_id
+            self._rooms_by_sid.setdefault(sid, set())
+            self._sids_by_user.setdefault(int(user_id), set()).add(sid)
+
+    def disconnect(self, sid: str) -> None:
+        with self._lock:
+            user_id = self._user_by_sid.pop(sid, None)
+            self._role_by_sid.pop(sid, None)
+            for room in self._rooms_by_sid.pop(sid, set()):
+                self._decrement(room)
+
+            if user_id is not None:
+                sids = self._sids_by_user.get(user_id)
+                if sids is not None:
+                    sids.discard(sid)
+                    if not sids:
+                        del self._sids_by_user[user_id]
+
+    def joined(self, sid: str, room: str) -> None:
+        with self._lock:
+            rooms = self._rooms_by_sid.setdefault(sid, set())
+            if room not in rooms:
+                rooms.add(room)
+                self._room_counts[room] = self._room_counts.get(room, 0) + 1
+
+    def left(self, sid: str, room: str) -> None:
+        with self._lock:
+            rooms = self._rooms_by_sid.get(sid)
+            if rooms is not None and room in rooms:
+                rooms.discard(room)
+                self._decrement(room)
+
+    def _decrement(self, room: str) -> None:
+        count = self._room_counts.get(room, 0) - 1
+        if count > 0:
+            self._room_counts[room] = count
+        else:
+            self._room_counts.pop(room, None)
+
+    # ---------------- consultas ----------------
+    def is_online(self, user_id: int) -> bool:
+        with self._lock:
+            return bool(self._sids_by_user.get(int(user_id)))
+
+    def has_listeners(self, rooms: Iterable[str]) -> bool:
+        if settings.socketio_message_queue:
+            return True
+        with self._lock:
+            return any(self._room_counts.get(room) for room in rooms)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._user_by_sid),
+                "users_online": len(self._sids_by_user),
+                "rooms": len(self._room_counts),
+            }
+
+    # ---------------- autorização ----------------
+    def can_join_conversation(
+        self,
+        *,
+        user_id: int,
+        conversation_id: int,
+        loader: Callable[[], bool],
+    ) -> bool:
+        return bool(
+            self._access_cache.get_or_load((int(user_id), int(conversation_id)), loader)
+        )
+
+
+session_registry = SocketSessionRegistry(
+    access_ttl_seconds=settings.socket_join_access_ttl_seconds,
+    access_max_entries=settings.socket_join_access_max_entries,
+)
@@ -1,14 +1,21 @@
 # app/infrastructure/realtime/socketio_conversation_notifier.py
 from __future__ import annotations
 
+from sqlalchemy.orm import Session
+
 from app.core.interfaces.conversation_notifier import (
     ConversationNotifier,
     ConversationCreatedEvent,
 )
-from app.infrastructure.realtime.socketio_server import socketio
+from app.infrastructure.realtime.realtime_dispatcher import realtime_dispatcher
+from app.infrastructure.realtime.rooms import PRIVILEGED_ROOMS, user_room
 
 
 class SocketIOConversationNotifier(ConversationNotifier):
+    def __init__(self, session: Session | None = None) -> None:
+        # eventos saem só após o commit desta sessão
+        self._session = session
+
     def notify_conversation_created(self, event: ConversationCreatedEvent) -> None:
         payload = {
             "conversation_id": event.conversation_id,
@@ -26,4 +33,8 @@ class SocketIOConversationNotifier(ConversationNotifier):
         if event.assignee is not None:
             payload["assignee"] = event.assignee
 
-        socketio.emit("conversation:new", payload)
+        # ✅ ADMIN/ANALYST + criador/responsável (sem broadcast global)
+        rooms = [*PRIVILEGED_ROOMS, user_room(event.created_by)]
+        if event.assigned_to is not None:
+            rooms.append(user_room(event.assigned_to))
+        realtime_dispatcher.emit_after_commit(self._session, "conversation:new", payload, to=rooms)
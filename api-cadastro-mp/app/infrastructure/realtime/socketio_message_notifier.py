@@ -1,11 +1,31 @@
 # app/infrastructure/realtime/socketio_message_notifier.py
 from __future__ import annotations
 
+from sqlalchemy.orm import Session
+
 from app.core.interfaces.message_notifier import MessageCreatedEvent, MessageNotifier
-from app.infrastructure.realtime.socketio_server import socketio
+from app.infrastructure.realtime.realtime_dispatcher import realtime_dispatcher
+from app.infrastructure.realtime.rooms import conversation_audience, conversation_room, user_room
+from app.infrastructure.realtime.session_registry import session_registry
+
+
+def merge_unread_update(previous: dict, current: dict) -> dict:
+    # valor absoluto: na janela de coalescência vale o último
+    return current
+
+
+realtime_dispatcher.register_merger("unread:update", merge_unread_update)
 
 
 class SocketIOMessageNotifier(MessageNotifier):
+    def __init__(self, session: Session | None = None) -> None:
+        # eventos saem só após o commit desta sessão
+        self._session = session
+
+    def has_audience(self, *, conversation_id: int, conversation_owner_id: int | None) -> bool:
+        return session_registry.has_listeners(
+            conversation_audience(conversation_id, conversation_owner_id))
+
     def notify_message_created(self, event: MessageCreatedEvent) -> None:
         payload = {
             "conversation_id": event.conversation_id,
@@ -40,9 +60,37 @@ class SocketIOMessageNotifier(MessageNotifier):
         if event.message_type_code is not None:
             payload["message_type_code"] = str(event.message_type_code)
 
-        # 1) room
-        room = f"conversation:{event.conversation_id}"
-        socketio.emit("message:new", payload, room=room)
+        # ✅ só quem pode ver a conversa (sem broadcast global)
+        realtime_dispatcher.emit_after_commit(
+            self._session,
+            "message:new",
+            payload,
+            to=conversation_audience(event.conversation_id, event.conversation_owner_id),
+        )
+
+    def notify_messages_read(self, *, conversation_id: int, user_id: int, last_read_message_id: int) -> None:
+        # quem está com a conversa aberta (room da conversa)
+        realtime_dispatcher.emit_after_commit(
+            self._session,
+            "message:read",
+            {
+                "conversation_id": conversation_id,
+                "user_id": user_id,
+                "last_read_message_id": last_read_message_id,
+            },
+            to=conversation_room(conversation_id),
+        )
+
+    def notify_unread_changed(self, *, conversation_id: int, unread_counts: dict[int, int]) -> None:
+        for user_id, unread_count in unread_counts.items():
+            room = user_room(user_id)
+            if not session_registry.has_listeners([room]):
+                continue
 
-        # 2) fallback global (não depender de join)
-        socketio.emit("message:new", payload)
+            realtime_dispatcher.emit_after_commit(
+                self._session,
+                "unread:update",
+                {"conversation_id": conversation_id, "unread_count": int(unread_count)},
+                to=room,
+                coalesce_key=conversation_id,
+            )
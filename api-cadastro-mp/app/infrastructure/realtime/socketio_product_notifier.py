@@ -1,16 +1,22 @@
 # app/infrastructure/realtime/socketio_product_notifier.py
 from __future__ import annotations
 
+from sqlalchemy.orm import Session
+
 from app.core.interfaces.product_notifier import (
     ProductNotifier,
     ProductCreatedEvent,
     ProductUpdatedEvent,
     ProductFlagChangedEvent,
 )
-from app.infrastructure.realtime.socketio_server import socketio
+from app.infrastructure.realtime.realtime_dispatcher import realtime_dispatcher
 
 
 class SocketIOProductNotifier(ProductNotifier):
+    def __init__(self, session: Session | None = None) -> None:
+        # eventos saem só após o commit desta sessão
+        self._session = session
+
     def notify_product_created(self, event: ProductCreatedEvent) -> None:
         payload = {
             "product_id": event.product_id,
@@ -19,7 +25,7 @@ class SocketIOProductNotifier(ProductNotifier):
             "codigo_atual": event.codigo_atual,
             "descricao": event.descricao,
         }
-        socketio.emit("product:created", payload)  # global
+        realtime_dispatcher.emit_after_commit(self._session, "product:created", payload)  # global
 
     def notify_product_updated(self, event: ProductUpdatedEvent) -> None:
         payload = {
@@ -29,7 +35,7 @@ class SocketIOProductNotifier(ProductNotifier):
             "codigo_atual": event.codigo_atual,
             "descricao": event.descricao,
         }
-        socketio.emit("product:updated", payload)  # global
+        realtime_dispatcher.emit_after_commit(self._session, "product:updated", payload)  # global
 
     def notify_product_flag_changed(self, event: ProductFlagChangedEvent) -> None:
         payload = {
@@ -40,4 +46,4 @@ class SocketIOProductNotifier(ProductNotifier):
             "changed_by": event.changed_by,
             "changed_at": event.changed_at_iso,
         }
-        socketio.emit("product:flag_changed", payload)  # global
+        realtime_dispatcher.emit_after_commit(self._session, "product:flag_changed", payload)  # global
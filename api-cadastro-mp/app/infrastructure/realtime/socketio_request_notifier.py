@@ -1,14 +1,79 @@
 # app/infrastructure/realtime/socketio_request_notifier.py
 from __future__ import annotations
 
+from typing import Any
+
+from sqlalchemy.orm import Session
+
 from app.core.interfaces.request_notifier import (
     RequestCreatedEvent,
     RequestItemChangedEvent,
     RequestNotifier,
 )
-from app.infrastructure.realtime.socketio_server import socketio
+from app.infrastructure.realtime.realtime_dispatcher import realtime_dispatcher
+from app.infrastructure.realtime.rooms import conversation_audience
+from app.infrastructure.realtime.session_registry import session_registry
+
+
+def merge_item_changed(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combina dois request:item_changed do mesmo request (janela de coalescência).
+    - versão: a mais nova; `from_version` = primeira da janela (o cliente
+      não vê a faixa como salto);
+    - changes.items: um por item (o mais recente vence); changes.item = o último;
+    - changes.fields: por id, valores mais novos por cima.
+    """
+    # commits concorrentes podem chegar fora de ordem: a base é a versão maior
+    if int(current.get("version") or 0) < int(previous.get("version") or 0):
+        previous, current = current, previous
+
+    merged = dict(current)
+    merged["from_version"] = min(
+        int(p.get("from_version", p.get("version")) or 0) for p in (previous, current)
+    )
+
+    kinds = {
+        k
+        for p in (previous, current)
+        for k in (p.get("change_kinds") or [p.get("change_kind")])
+        if k
+    }
+    merged["change_kinds"] = sorted(kinds)
+    if len(kinds) > 1:
+        merged["change_kind"] = "MULTI"
+
+    prev_changes = previous.get("changes") or {}
+    cur_changes = current.get("changes") or {}
+
+    items: dict[int, dict] = {}
+    for it in [*(prev_changes.get("items") or [prev_changes.get("item")]),
+               *(cur_changes.get("items") or [cur_changes.get("item")])]:
+        if it:
+            items[int(it["id"])] = it
+
+    fields: dict[int, dict] = {}
+    for f in [*(prev_changes.get("fields") or []), *(cur_changes.get("fields") or [])]:
+        fields[int(f["id"])] = {**fields.get(int(f["id"]), {}), **f}
+
+    changes: dict[str, Any] = {"item": cur_changes.get("item"), "items": list(items.values())}
+    if fields:
+        changes["fields"] = list(fields.values())
+    merged["changes"] = changes
+    return merged
+
+
+realtime_dispatcher.register_merger("request:item_changed", merge_item_changed)
+
 
 class SocketIORequestNotifier(RequestNotifier):
+    def __init__(self, session: Session | None = None) -> None:
+        # eventos saem só após o commit desta sessão
+        self._session = session
+
+    def has_audience(self, *, conversation_id: int, conversation_owner_id: int | None) -> bool:
+        return session_registry.has_listeners(
+            conversation_audience(conversation_id, conversation_owner_id))
+
     def notify_request_created(self, event: RequestCreatedEvent) -> None:
         payload = {
             "request_id": event.request_id,
@@ -19,10 +84,15 @@ class SocketIORequestNotifier(RequestNotifier):
         }
         if event.request is not None:
             payload["request"] = event.request
+        payload["version"] = int(event.version)
 
-        room = f"conversation:{event.conversation_id}"
-        socketio.emit("request:created", payload, room=room)
-        socketio.emit("request:created", payload)  # ✅ fallback global (volta!)
+        # ✅ só quem pode ver a conversa (sem broadcast global)
+        realtime_dispatcher.emit_after_commit(
+            self._session,
+            "request:created",
+            payload,
+            to=conversation_audience(event.conversation_id, event.conversation_owner_id),
+        )
 
     def notify_request_item_changed(self, event: RequestItemChangedEvent) -> None:
         payload = {
@@ -35,11 +105,22 @@ class SocketIORequestNotifier(RequestNotifier):
             "request_status_id": event.request_status_id,
             "updated_at": event.updated_at_iso,
         }
+        if event.version is not None:
+            payload["version"] = int(event.version)
+        if event.request_owner_id is not None:
+            payload["request_owner_id"] = int(event.request_owner_id)
+        if event.changes is not None:
+            payload["changes"] = event.changes
         if event.request is not None:
             payload["request"] = event.request
         if event.item is not None:
             payload["item"] = event.item
 
-        room = f"conversation:{event.conversation_id}"
-        socketio.emit("request:item_changed", payload, room=room)
-        socketio.emit("request:item_changed", payload)  # ✅ fallback global (volta!)
\ No newline at end of file
+        realtime_dispatcher.emit_after_commit(
+            self._session,
+            "request:item_changed",
+            payload,
+            to=conversation_audience(event.conversation_id, event.conversation_owner_id),
+            # rajadas no mesmo request saem como um evento só
+            coalesce_key=int(event.request_id),
+        )
\ No newline at end of file
@@ -5,6 +5,8 @@ import os
 
 from flask_socketio import SocketIO
 
+from app.config.settings import settings
+
 
 def _get_socketio_cors_origins() -> list[str]:
     raw_origins = os.getenv("SOCKETIO_CORS_ORIGINS", "").strip()
@@ -28,6 +30,27 @@ def _get_socketio_cors_origins() -> list[str]:
     ]
 
 
+def get_message_queue_options() -> dict:
+    """
+    Fila entre workers/containers (SOCKETIO_MESSAGE_QUEUE):
+    - vazio: só em memória (um worker);
+    - "postgres": LISTEN/NOTIFY no próprio banco da aplicação;
+    - URL redis:// | amqp:// | memory:// ...: backends do python-socketio
+      (Kombu precisa estar instalado para amqp/memory).
+    Passado no socketio.init_app (o client manager precisa saber que não é write-only).
+    """
+    queue = (settings.socketio_message_queue or "").strip()
+    if not queue:
+        return {}
+
+    if queue in ("postgres", "postgresql"):
+        from app.infrastructure.realtime.pg_socketio_manager import PostgresNotifyManager
+
+        return {"client_manager": PostgresNotifyManager(channel=settings.socketio_channel)}
+
+    return {"message_queue": queue, "channel": settings.socketio_channel}
+
+
 socketio = SocketIO(
     cors_allowed_origins=_get_socketio_cors_origins(),
     async_mode="eventlet",
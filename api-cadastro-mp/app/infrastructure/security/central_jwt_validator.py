@@ -1,13 +1,91 @@
 # app/infrastructure/security/central_jwt_validator.py
 from __future__ import annotations
 
+import threading
+import time
+
+import eventlet
 import jwt
-from jwt import PyJWKClient
+from jwt import PyJWK, PyJWKClient
 
 from app.config.settings import settings
 from app.core.exceptions import UnauthorizedError
 
 
+class JwksKeyCache:
+    """
+    Chaves públicas (JWKS) do Keycloak em memória, compartilhadas pelo processo.
+
+    - TTL: passado `ttl_seconds`, continua servindo as chaves atuais e
+      atualiza em background (uma green thread por vez).
+    - kid desconhecido (rotação de chave): busca o JWKS de novo uma vez,
+      no máximo a cada `min_refetch_seconds` (kid aleatório não vira
+      uma requisição ao Keycloak por login).
+    - Falha ao buscar com chaves já carregadas: segue com as atuais.
+    """
+
+    def __init__(self, *, url: str, ttl_seconds: int, min_refetch_seconds: int, timeout_seconds: int) -> None:
+        self._client = PyJWKClient(url, cache_jwk_set=False, timeout=timeout_seconds)
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._min_refetch_seconds = max(0, int(min_refetch_seconds))
+        self._lock = threading.Lock()
+
+        self._keys: dict[str, PyJWK] = {}
+        self._fetched_at: float | None = None
+        self._refreshing = False
+
+    def get(self, kid: str) -> PyJWK:
+        if self._fetched_at is None:
+            self.refresh()
+        elif (time.monotonic() - self._fetched_at) >= self._ttl_seconds:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # kid novo: o Keycloak pode ter rotacionado a chave
+        fetched_at = self._fetched_at
+        if fetched_at is None or (time.monotonic() - fetched_at) >= self._min_refetch_seconds:
+            self.refresh()
+            key = self._keys.get(kid)
+
+        if key is None:
+            raise jwt.InvalidTokenError(f"Chave de assinatura desconhecida (kid={kid}).")
+        return key
+
+    def refresh(self) -> None:
+        try:
+            signing_keys = self._client.get_signing_keys(refresh=True)
+        except jwt.PyJWKClientError:
+            # sem chaves carregadas não dá para validar nada
+            if not self._keys:
+                raise
+            signing_keys = None
+
+        with self._lock:
+            if signing_keys is not None:
+                self._keys = {k.key_id: k for k in signing_keys}
+            self._fetched_at = time.monotonic()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run() -> None:
+            try:
+                self.refresh()
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        eventlet.spawn(_run)
+
+
 class CentralJwtValidator:
     """
     Valida o access_token emitido pelo Keycloak/Minha DELPI.
@@ -23,13 +101,26 @@ class CentralJwtValidator:
         if not settings.central_jwt_issuer:
             raise RuntimeError("CENTRAL_JWT_ISSUER não configurado.")
 
-        self._jwks_client = PyJWKClient(settings.central_jwks_url)
+        self._jwks = JwksKeyCache(
+            url=settings.central_jwks_url,
+            ttl_seconds=settings.central_jwks_ttl_seconds,
+            min_refetch_seconds=settings.central_jwks_min_refetch_seconds,
+            timeout_seconds=settings.central_jwks_timeout_seconds,
+        )
         self._issuer = settings.central_jwt_issuer
         self._audience = settings.central_jwt_audience
 
+    def warm(self) -> None:
+        """Carrega o JWKS antes do primeiro login."""
+        self._jwks.refresh()
+
     def decode(self, token: str) -> dict:
         try:
-            signing_key = self._jwks_client.get_signing_key_from_jwt(token)
+            kid = jwt.get_unverified_header(token).get("kid")
+            if not kid:
+                raise jwt.InvalidTokenError("Token sem kid.")
+
+            signing_key = self._jwks.get(kid)
 
             return jwt.decode(
                 token,
@@ -43,6 +134,8 @@ class CentralJwtValidator:
             )
         except jwt.ExpiredSignatureError as exc:
             raise UnauthorizedError("Token SSO expirado.") from exc
+        except jwt.PyJWKClientError as exc:
+            raise UnauthorizedError("Não foi possível obter as chaves do SSO.") from exc
         except jwt.InvalidTokenError as exc:
             raise UnauthorizedError("Token SSO inválido.") from exc
 
@@ -64,4 +157,21 @@ class CentralJwtValidator:
             "email": str(email).strip().lower(),
             "full_name": str(full_name).strip(),
             "claims": claims,
-        }
\ No newline at end of file
+        }
+
+
+_central_validator: CentralJwtValidator | None = None
+_central_validator_lock = threading.Lock()
+
+
+def get_central_jwt_validator() -> CentralJwtValidator:
+    """
+    ✅ Instância única por processo (o cache de JWKS vale para todos os logins).
+    Criada no primeiro uso: sem SSO configurado, só o /sso-login falha.
+    """
+    global _central_validator
+    if _central_validator is None:
+        with _central_validator_lock:
+            if _central_validator is None:
+                _central_validator = CentralJwtValidator()
+    return _central_validator
@@ -1,5 +1,9 @@
 # app/infrastructure/security/jwt_provider.py
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
@@ -16,7 +20,45 @@ class JwtProvider:
         self._audience = settings.jwt_audience
         self._algorithm = "HS256"
 
+        # ✅ LRU de tokens já verificados: sha256(token) -> (exp, claims)
+        self._verified: OrderedDict[str, tuple[int, dict]] = OrderedDict()
+        self._verified_max = max(0, int(settings.jwt_verified_cache_size))
+        self._lock = threading.Lock()
+
+    def _cache_key(self, token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _remember(self, token: str, claims: dict) -> None:
+        if self._verified_max <= 0:
+            return
+        with self._lock:
+            self._verified[self._cache_key(token)] = (int(claims["exp"]), dict(claims))
+            while len(self._verified) > self._verified_max:
+                self._verified.popitem(last=False)
+
+    def _recall(self, token: str) -> dict | None:
+        if self._verified_max <= 0:
+            return None
+        key = self._cache_key(token)
+        with self._lock:
+            entry = self._verified.get(key)
+            if entry is None:
+                return None
+            exp, claims = entry
+            if exp <= int(time.time()):
+                del self._verified[key]
+                return None
+            self._verified.move_to_end(key)
+            return dict(claims)
+
     def issue_token(self, *, subject: str, payload: dict, minutes: int, token_type: str) -> str:
+        token, _ = self.issue_token_with_claims(
+            subject=subject, payload=payload, minutes=minutes, token_type=token_type)
+        return token
+
+    def issue_token_with_claims(
+        self, *, subject: str, payload: dict, minutes: int, token_type: str
+    ) -> tuple[str, dict]:
         now = datetime.now(tz=timezone.utc)
         exp = now + timedelta(minutes=minutes)
 
@@ -30,7 +72,11 @@ class JwtProvider:
             "typ": token_type,  # "access" | "refresh"
         }
         claims.update(payload)
-        return jwt.encode(claims, self._secret, algorithm=self._algorithm)
+        token = jwt.encode(claims, self._secret, algorithm=self._algorithm)
+
+        # acabou de ser assinado aqui: já conta como verificado
+        self._remember(token, claims)
+        return token, dict(claims)
 
     def issue_access_token(self, *, subject: str, payload: dict, minutes: int = 0) -> str:
         # se minutes não for passado, usa settings.jwt_access_minutes
@@ -38,13 +84,22 @@ class JwtProvider:
         return self.issue_token(subject=subject, payload=payload, minutes=ttl, token_type="access")
 
     def issue_refresh_token(self, *, subject: str, minutes: int = 0) -> str:
+        token, _ = self.issue_refresh_token_with_claims(subject=subject, minutes=minutes)
+        return token
+
+    def issue_refresh_token_with_claims(self, *, subject: str, minutes: int = 0) -> tuple[str, dict]:
         # refresh token deve ser minimalista
         ttl = minutes if minutes and minutes > 0 else settings.jwt_refresh_minutes
-        return self.issue_token(subject=subject, payload={}, minutes=ttl, token_type="refresh")
+        return self.issue_token_with_claims(subject=subject, payload={}, minutes=ttl, token_type="refresh")
 
     def decode(self, token: str) -> dict:
+        # ✅ token idêntico já validado e ainda não expirado: pula assinatura/claims
+        cached = self._recall(token)
+        if cached is not None:
+            return cached
+
         try:
-            return jwt.decode(
+            claims = jwt.decode(
                 token,
                 self._secret,
                 algorithms=[self._algorithm],
@@ -56,3 +111,10 @@ class JwtProvider:
             raise UnauthorizedError("Token expirado.") from e
         except jwt.InvalidTokenError as e:
             raise UnauthorizedError("Token inválido.") from e
+
+        self._remember(token, claims)
+        return dict(claims)
+
+
+# ✅ instância única por processo (reaproveita o LRU de tokens verificados)
+jwt_provider = JwtProvider()
@@ -2,6 +2,179 @@ import base64
 import hashlib
 import hmac
 import os
+import threading
+import time
+from typing import Callable, TypeVar
+
+from eventlet import patcher, tpool
+
+from app.config.settings import settings
+from app.core.exceptions import ConflictError
+
+T = TypeVar("T")
+
+
+class _HashPool:
+    """
+    PBKDF2 (600k iterações) leva centenas de ms de CPU; sob eventlet isso
+    travaria o hub do worker (inclusive o realtime). Aqui o cálculo roda em
+    thread nativa (eventlet.tpool; hashlib libera o GIL) com no máximo
+    `max_concurrency` em paralelo. Os demais esperam na fila até
+    `queue_timeout_seconds`.
+    """
+
+    def __init__(self, *, max_concurrency: int, queue_timeout_seconds: int) -> None:
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._slots = threading.BoundedSemaphore(self._max_concurrency)
+        self._queue_timeout = max(1, int(queue_timeout_seconds))
+        self._lock = threading.Lock()
+
+        self._completed = 0
+        self._rejected = 0
+        self._in_flight = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._run_ms_total = 0.0
+
+    def run(self, fn: Callable[[], T]) -> T:
+        queued_at = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+            self._max_waiting = max(self._max_waiting, self._waiting)
+
+        acquired = self._slots.acquire(timeout=self._queue_timeout)
+
+        wait_ms = (time.monotonic() - queued_at) * 1000
+        with self._lock:
+            self._waiting -= 1
+            if not acquired:
+                self._rejected += 1
+            else:
+                self._in_flight += 1
+                self._wait_ms_total += wait_ms
+                self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+
+        if not acquired:
+            raise ConflictError("Servidor ocupado validando senhas. Tente novamente em instantes.")
+
+        started_at = time.monotonic()
+        try:
+            # fora do monkey_patch (scripts/CLI) chama direto
+            if patcher.is_monkey_patched("thread"):
+                return tpool.execute(fn)
+            return fn()
+        finally:
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._run_ms_total += (time.monotonic() - started_at) * 1000
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self._completed or 1
+            return {
+                "max_concurrency": self._max_concurrency,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "max_waiting": self._max_waiting,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_ms_total / done, 1),
+                "max_wait_ms": round(self._wait_ms_max, 1),
+                "avg_run_ms": round(self._run_ms_total / done, 1),
+            }
+
+
+# ✅ compartilhado pelo processo (login, troca de senha, criação de usuário)
+password_hash_pool = _HashPool(
+    max_concurrency=settings.password_hash_max_concurrency,
+    queue_timeout_seconds=settings.password_hash_queue_timeout_seconds,
+)
+
+
+class Pbkdf2Sha256Hasher:
+    """PBKDF2-HMAC-SHA256. Custo = iterações (coluna password_iterations)."""
+
+    name = "pbkdf2_sha256"
+    aliases = ("pbkdf2",)
+
+    def __init__(self, *, iterations: int) -> None:
+        self.cost = max(1, int(iterations))
+
+    def algo_id(self) -> str:
+        return self.name
+
+    def derive(self, password: bytes, salt: bytes, *, algo: str, cost: int) -> bytes:
+        return hashlib.pbkdf2_hmac("sha256", password, salt, cost)
+
+    def is_current(self, *, algo: str, cost: int) -> bool:
+        return algo == self.name and int(cost) == self.cost
+
+
+class ScryptHasher:
+    """
+    scrypt (memory-hard). Custo = N (coluna password_iterations);
+    r e p vão no próprio algo ("scrypt:r:p"), sem migration.
+    Memória por hash ~ 128 * N * r bytes.
+    """
+
+    name = "scrypt"
+    aliases = ()
+
+    def __init__(self, *, n: int, r: int, p: int) -> None:
+        self.cost = max(2, int(n))
+        self.r = max(1, int(r))
+        self.p = max(1, int(p))
+
+    def algo_id(self) -> str:
+        return f"{self.name}:{self.r}:{self.p}"
+
+    @staticmethod
+    def _parse(algo: str) -> tuple[int, int]:
+        _, r, p = algo.split(":")
+        return int(r), int(p)
+
+    def derive(self, password: bytes, salt: bytes, *, algo: str, cost: int) -> bytes:
+        r, p = self._parse(algo)
+        return hashlib.scrypt(
+            password,
+            salt=salt,
+            n=cost,
+            r=r,
+            p=p,
+            maxmem=256 * cost * r * p,
+            dklen=32,
+        )
+
+    def is_current(self, *, algo: str, cost: int) -> bool:
+        return algo == self.algo_id() and int(cost) == self.cost
+
+
+# ✅ algoritmos conhecidos (hash novo usa PASSWORD_HASH_ALGO; os demais só verificam)
+_HASHERS: dict[str, Pbkdf2Sha256Hasher | ScryptHasher] = {}
+
+
+def register_hasher(hasher: Pbkdf2Sha256Hasher | ScryptHasher) -> None:
+    for name in (hasher.name, *hasher.aliases):
+        _HASHERS[name] = hasher
+
+
+register_hasher(Pbkdf2Sha256Hasher(iterations=settings.password_pbkdf2_iterations))
+register_hasher(
+    ScryptHasher(
+        n=settings.password_scrypt_n,
+        r=settings.password_scrypt_r,
+        p=settings.password_scrypt_p,
+    )
+)
+
+
+def get_hasher(algo: str) -> Pbkdf2Sha256Hasher | ScryptHasher | None:
+    # "scrypt:8:1" -> "scrypt"
+    return _HASHERS.get((algo or "").split(":", 1)[0])
 
 
 class PasswordHasher:
@@ -9,6 +182,13 @@ class PasswordHasher:
     DEFAULT_ITERATIONS = 600_000
     SALT_BYTES = 16
 
+    @staticmethod
+    def _current() -> Pbkdf2Sha256Hasher | ScryptHasher:
+        hasher = get_hasher(settings.password_hash_algo)
+        if hasher is None:
+            raise RuntimeError(f"PASSWORD_HASH_ALGO desconhecido: {settings.password_hash_algo}")
+        return hasher
+
     @classmethod
     def hash_password(
         cls, password: str, *, iterations: int | None = None
@@ -16,19 +196,18 @@ class PasswordHasher:
         if not password or len(password) < 8:
             raise ValueError("Senha inválida (mín. 8 caracteres).")
 
-        it = iterations or cls.DEFAULT_ITERATIONS
+        hasher = cls._current()
+        algo = hasher.algo_id()
+        cost = iterations or hasher.cost
         salt = os.urandom(cls.SALT_BYTES)
 
-        dk = hashlib.pbkdf2_hmac(
-            "sha256",
-            password.encode("utf-8"),
-            salt,
-            it,
+        dk = password_hash_pool.run(
+            lambda: hasher.derive(password.encode("utf-8"), salt, algo=algo, cost=cost)
         )
 
         password_hash = base64.b64encode(dk).decode("utf-8")
         password_salt = base64.b64encode(salt).decode("utf-8")
-        return (password_hash, password_salt, cls.DEFAULT_ALGO, it)
+        return (password_hash, password_salt, algo, cost)
 
     @classmethod
     def verify_password(
@@ -40,8 +219,8 @@ class PasswordHasher:
         iterations: int,
         algo: str,
     ) -> bool:
-        if algo not in (cls.DEFAULT_ALGO, "pbkdf2"):
-            # compat simples com seu default atual
+        hasher = get_hasher(algo)
+        if hasher is None:
             return False
 
         try:
@@ -50,10 +229,60 @@ class PasswordHasher:
         except Exception:
             return False
 
-        dk = hashlib.pbkdf2_hmac(
-            "sha256",
-            password.encode("utf-8"),
-            salt,
-            iterations,
-        )
+        try:
+            dk = password_hash_pool.run(
+                lambda: hasher.derive(password.encode("utf-8"), salt, algo=algo, cost=iterations)
+            )
+        except ValueError:
+            # parâmetros gravados inválidos (ex.: algo "scrypt" sem r/p)
+            return False
         return hmac.compare_digest(dk, expected)
+
+    @classmethod
+    def needs_rehash(cls, *, algo: str, iterations: int) -> bool:
+        """True se o hash gravado não usa o algoritmo/custo configurados hoje."""
+        return not cls._current().is_current(algo=algo, cost=iterations)
+
+
+def calibrate(algo: str, *, target_ms: float, samples: int = 3) -> dict:
+    """
+    Sugere o custo de `algo` para um hash levar ~target_ms neste servidor.
+    pbkdf2_sha256: escala linear das iterações; scrypt: maior N (potência de 2)
+    que fica dentro do alvo e de PASSWORD_SCRYPT_MAX_MEMORY_MB, com r/p configurados.
+    Usado por scripts/calibrate_password_hash.py.
+    """
+    hasher = get_hasher(algo)
+    if hasher is None:
+        raise ValueError(f"Algoritmo desconhecido: {algo}")
+
+    password = b"calibrate-password"
+    salt = os.urandom(PasswordHasher.SALT_BYTES)
+    algo_id = hasher.algo_id()
+
+    def _measure(cost: int) -> float:
+        best = float("inf")
+        for _ in range(max(1, samples)):
+            started_at = time.perf_counter()
+            hasher.derive(password, salt, algo=algo_id, cost=cost)
+            best = min(best, (time.perf_counter() - started_at) * 1000)
+        return best
+
+    if isinstance(hasher, Pbkdf2Sha256Hasher):
+        probe = 100_000
+        ms = _measure(probe)
+        cost = max(1, int(probe * target_ms / ms))
+        return {"algo": algo_id, "cost": cost, "measured_ms": round(_measure(cost), 1)}
+
+    # memória por hash ~ 128 * N * r: N não passa do teto configurado
+    max_memory = max(1, settings.password_scrypt_max_memory_mb) * 1024 * 1024
+    cost, ms = 2 ** 10, _measure(2 ** 10)
+    while 128 * (cost * 2) * hasher.r <= max_memory:
+        try:
+            next_ms = _measure(cost * 2)
+        except (ValueError, MemoryError):
+            # OpenSSL/SO recusou a memória: fica com o último custo que funcionou
+            break
+        if next_ms > target_ms:
+            break
+        cost, ms = cost * 2, next_ms
+    return {"algo": algo_id, "cost": cost, "measured_ms": round(ms, 1)}
@@ -11,11 +11,16 @@ from flask import Flask  # noqa: E402
 from flask_cors import CORS  # noqa: E402
 
 from app.api.realtime.socket_handlers import register_socket_handlers  # noqa: E402
-from app.infrastructure.realtime.socketio_server import socketio  # noqa: E402
+from app.infrastructure.realtime.socketio_server import get_message_queue_options, socketio  # noqa: E402
 from app.config.flask_config import configure_app  # noqa: E402
 from app.config.settings import settings  # noqa: E402
 from app.api.routes import register_routes  # noqa: E402
 from app.api.middlewares.error_handler import register_error_handlers  # noqa: E402
+from app.infrastructure.cache.reference_cache import reference_cache  # noqa: E402
+from app.infrastructure.cache.revoked_token_cache import revoked_token_cache  # noqa: E402
+from app.infrastructure.database.green_psycopg import patch_psycopg  # noqa: E402
+from app.infrastructure.database.session import db_session  # noqa: E402
+from app.infrastructure.security.central_jwt_validator import get_central_jwt_validator  # noqa: E402
 
 import app.infrastructure.database.models  # noqa: F401, E402
 
@@ -47,7 +52,39 @@ def _get_cors_origins() -> list[str]:
     ]
 
 
+def _warm_reference_cache() -> None:
+    """
+    Aquece o cache das tabelas de referência.
+    Se o banco ainda não estiver disponível, o cache carrega no primeiro uso.
+    """
+    try:
+        with db_session() as session:
+            reference_cache.warm(session)
+    except Exception:
+        reference_cache.invalidate()
+
+
+def _warm_central_jwks() -> None:
+    """
+    Busca o JWKS do SSO em background, para o primeiro login não esperar o Keycloak.
+    Se falhar, o cache carrega no primeiro /sso-login.
+    """
+    if not settings.central_jwks_url or not settings.central_jwt_issuer:
+        return
+
+    def _run() -> None:
+        try:
+            get_central_jwt_validator().warm()
+        except Exception:
+            pass
+
+    eventlet.spawn(_run)
+
+
 def create_app() -> Flask:
+    # psycopg2 não é coberto pelo monkey_patch: sem isso connect/LISTEN travam o hub
+    patch_psycopg()
+
     app = Flask(__name__)
 
     CORS(
@@ -67,9 +104,17 @@ def create_app() -> Flask:
 
     register_error_handlers(app)
 
-    socketio.init_app(app, path=SOCKET_PREFIX)
+    # SOCKETIO_MESSAGE_QUEUE: emits chegam aos clientes de todos os workers
+    socketio.init_app(app, path=SOCKET_PREFIX, **get_message_queue_options())
     register_socket_handlers()
 
+    _warm_reference_cache()
+
+    # revogações de outros workers (logout) chegam via LISTEN/NOTIFY
+    revoked_token_cache.start_listener()
+
+    _warm_central_jwks()
+
     return app
 
 
@@ -23,27 +23,121 @@ class ConversationParticipantRepository(BaseRepository[ConversationParticipantMo
         )
         return self._session.execute(stmt).scalars().first()
 
+    def _count_unread(self, *, conversation_id: int, user_id: int, after_message_id):
+        # mensagens de outros remetentes depois de `after_message_id` (usa ix_msg_conversation_id_keyset)
+        return (
+            select(func.count(MessageModel.id))
+            .where(
+                MessageModel.conversation_id == conversation_id,
+                MessageModel.id > func.coalesce(after_message_id, 0),
+                MessageModel.sender_id != user_id,
+                MessageModel.is_deleted.is_(False),
+            )
+            .scalar_subquery()
+        )
+
     def ensure(self, *, conversation_id: int, user_id: int) -> ConversationParticipantModel:
         existing = self.get(conversation_id=conversation_id, user_id=user_id)
         if existing:
             return existing
 
-        model = ConversationParticipantModel(conversation_id=conversation_id, user_id=user_id)
+        # participante novo ainda não leu nada: começa com todas as mensagens de outros
+        unread_count = self._session.execute(
+            select(self._count_unread(conversation_id=conversation_id, user_id=user_id, after_message_id=None))
+        ).scalar_one()
+
+        model = ConversationParticipantModel(
+            conversation_id=conversation_id,
+            user_id=user_id,
+            unread_count=int(unread_count or 0),
+        )
         self._session.add(model)
         self._session.flush()
         return model
 
-    def set_last_read(self, *, conversation_id: int, user_id: int, last_read_message_id: int) -> None:
-        stmt = (
-            update(ConversationParticipantModel)
+    def set_last_read(self, *, conversation_id: int, user_id: int, last_read_message_id: int) -> int | None:
+        """
+        Atualiza a última lida e recalcula o contador só desta conversa/usuário
+        (normalmente 0 ou poucas mensagens depois de `last_read_message_id`).
+        Retorna o novo unread_count (None se não houver participante).
+        """
+        # trava a linha antes de contar: um create_message concorrente que já fez
+        # o +1 (e segura o lock) commita antes, e a contagem abaixo, em outro
+        # comando (novo snapshot no READ COMMITTED), já enxerga a mensagem dele
+        locked = (
+            select(ConversationParticipantModel.id)
             .where(
                 ConversationParticipantModel.conversation_id == conversation_id,
                 ConversationParticipantModel.user_id == user_id,
                 ConversationParticipantModel.is_deleted.is_(False),
             )
-            .values(last_read_message_id=last_read_message_id, last_read_at=func.now(), updated_at=func.now())
+            .with_for_update()
+        )
+        participant_id = self._session.execute(locked).scalar_one_or_none()
+        if participant_id is None:
+            return None
+
+        unread_count = int(
+            self._session.execute(
+                select(
+                    self._count_unread(
+                        conversation_id=conversation_id,
+                        user_id=user_id,
+                        after_message_id=last_read_message_id,
+                    )
+                )
+            ).scalar_one()
+            or 0
+        )
+
+        stmt = (
+            update(ConversationParticipantModel)
+            .where(ConversationParticipantModel.id == participant_id)
+            .values(
+                last_read_message_id=last_read_message_id,
+                last_read_at=func.now(),
+                updated_at=func.now(),
+                unread_count=unread_count,
+            )
         )
         self._session.execute(stmt)
+        return unread_count
+
+    def increment_unread(self, *, conversation_id: int, sender_id: int) -> dict[int, int]:
+        """
+        Mensagem nova: +1 para todos os participantes exceto o remetente.
+        Retorna {user_id: unread_count}.
+        """
+        stmt = (
+            update(ConversationParticipantModel)
+            .where(
+                ConversationParticipantModel.conversation_id == conversation_id,
+                ConversationParticipantModel.user_id != sender_id,
+                ConversationParticipantModel.is_deleted.is_(False),
+            )
+            .values(unread_count=ConversationParticipantModel.unread_count + 1)
+            .returning(ConversationParticipantModel.user_id, ConversationParticipantModel.unread_count)
+        )
+        return {int(r.user_id): int(r.unread_count) for r in self._session.execute(stmt).all()}
+
+    def decrement_unread(self, *, conversation_id: int, message_id: int, sender_id: int) -> dict[int, int]:
+        """
+        Mensagem excluída: -1 para quem ainda não a tinha lido (exceto o remetente).
+        Retorna {user_id: unread_count}.
+        """
+        stmt = (
+            update(ConversationParticipantModel)
+            .where(
+                ConversationParticipantModel.conversation_id == conversation_id,
+                ConversationParticipantModel.user_id != sender_id,
+                ConversationParticipantModel.is_deleted.is_(False),
+                func.coalesce(ConversationParticipantModel.last_read_message_id, 0) < message_id,
+                ConversationParticipantModel.unread_count > 0,
+            )
+            .values(unread_count=ConversationParticipantModel.unread_count - 1)
+            .returning(ConversationParticipantModel.user_id, ConversationParticipantModel.unread_count)
+        )
+        return {int(r.user_id): int(r.unread_count) for r in self._session.execute(stmt).all()}
 
     def get_unread_count_by_conversation(self, *, user_id: int, created_by_id: int | None = None) -> dict[int, int]:
         """
@@ -51,16 +145,13 @@ class ConversationParticipantRepository(BaseRepository[ConversationParticipantMo
         {
             conversation_id: unread_count
         }
+        Lê o contador mantido em tbConversationParticipants (só conversas com pendência).
         """
 
         stmt = (
             select(
-                MessageModel.conversation_id,
-                func.count(MessageModel.id).label("unread_count"),
-            )
-            .join(
-                ConversationParticipantModel,
-                ConversationParticipantModel.conversation_id == MessageModel.conversation_id,
+                ConversationParticipantModel.conversation_id,
+                ConversationParticipantModel.unread_count,
             )
             .join(
                 ConversationModel,
@@ -69,28 +160,15 @@ class ConversationParticipantRepository(BaseRepository[ConversationParticipantMo
             .where(
                 ConversationParticipantModel.user_id == user_id,
                 ConversationParticipantModel.is_deleted.is_(False),
+                ConversationParticipantModel.unread_count > 0,
                 ConversationModel.is_deleted.is_(False),
-                MessageModel.is_deleted.is_(False),
-
-                # mensagens depois da última lida
-                MessageModel.id > func.coalesce(
-                    ConversationParticipantModel.last_read_message_id, 0
-                ),
-
-                # não contar mensagens do próprio usuário
-                MessageModel.sender_id != user_id,
-
-                MessageModel.is_deleted.is_(False),
             )
         )
 
-        
         # created_by (Request.owner)
         if created_by_id is not None:
             stmt = stmt.where(ConversationModel.created_by == int(created_by_id))
 
-        stmt  = stmt.group_by(MessageModel.conversation_id)
-        
         rows = self._session.execute(stmt).all()
 
-        return {row.conversation_id: row.unread_count for row in rows}
\ No newline at end of file
+        return {row.conversation_id: row.unread_count for row in rows}
@@ -45,6 +45,44 @@ class MessageRepository(BaseRepository[MessageModel]):
         )
         return list(self._session.execute(stmt).all())
 
+    def list_rows_page_by_conversation(
+        self,
+        *,
+        conversation_id: int,
+        limit: int,
+        before_id: int | None = None,
+        after_id: int | None = None,
+    ) -> tuple[list, bool]:
+        """
+        Paginação keyset por tbMessages.id (ix_msg_conversation_id_keyset).
+        - after_id: mensagens mais novas que after_id (id ASC)
+        - before_id / sem cursor: mensagens mais antigas que before_id, a partir das mais recentes
+        Retorna (rows em ordem id ASC, has_more).
+        """
+        sender = aliased(UserModel)
+        stmt = (
+            select(MessageModel, sender)
+            .join(sender, sender.id == MessageModel.sender_id)
+            .where(MessageModel.conversation_id == conversation_id, MessageModel.is_deleted.is_(False))
+        )
+
+        if after_id is not None:
+            stmt = stmt.where(MessageModel.id > int(after_id)).order_by(MessageModel.id.asc())
+        else:
+            if before_id is not None:
+                stmt = stmt.where(MessageModel.id < int(before_id))
+            stmt = stmt.order_by(MessageModel.id.desc())
+
+        # busca 1 a mais para saber se existe próxima página
+        rows = list(self._session.execute(stmt.limit(int(limit) + 1)).all())
+        has_more = len(rows) > int(limit)
+        rows = rows[: int(limit)]
+
+        if after_id is None:
+            rows.reverse()
+
+        return rows, has_more
+
     def max_message_id_in_conversation(self, *, conversation_id: int, message_ids: list[int]) -> int | None:
         stmt = (
             select(func.max(MessageModel.id))
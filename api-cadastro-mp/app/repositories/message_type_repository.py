@@ -1,9 +1,9 @@
 # # app/repositories/message_type_repository.py
 
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.base_repository import BaseRepository
+from app.infrastructure.cache.reference_cache import reference_cache
 from app.infrastructure.database.models.message_type_model import MessageTypeModel
 
 
@@ -12,8 +12,8 @@ class MessageTypeRepository(BaseRepository[MessageTypeModel]):
         super().__init__(session)
 
     def get_id_by_code(self, code: str) -> int | None:
-        stmt = select(MessageTypeModel.id).where(
-            MessageTypeModel.code == code,
-            MessageTypeModel.is_deleted.is_(False),
-        )
-        return self._session.execute(stmt).scalar_one_or_none()
+        # ✅ cache em processo (tabela de seed)
+        return reference_cache.message_type_id_by_code(self._session, code)
+
+    def get_code_by_id(self, message_type_id: int) -> str | None:
+        return reference_cache.message_type_code_by_id(self._session, message_type_id)
@@ -1,10 +1,13 @@
 # app/repositories/product_repository.py
 
 from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core.base_repository import BaseRepository
 from app.infrastructure.database.models.product_model import ProductModel
+from app.infrastructure.database.models.product_field_model import ProductFieldModel
+from app.infrastructure.database.models.product_summary_model import ProductSummaryModel
 
 class ProductRepository(BaseRepository[ProductModel]):
     def __init__(self, session: Session) -> None:
@@ -30,3 +33,71 @@ class ProductRepository(BaseRepository[ProductModel]):
         )
         res = self._session.execute(stmt)
         return (res.rowcount or 0) > 0
+
+    def refresh_summary(self, product_id: int) -> None:
+        """
+        Recalcula a linha de tbProductSummary do produto (upsert), na mesma transação.
+        Chamar depois de qualquer escrita em tbProduct/tbProductFields do produto.
+        """
+        pid = int(product_id)
+
+        def _field_value(tag: str):
+            return (
+                select(ProductFieldModel.field_value)
+                .where(
+                    ProductFieldModel.product_id == ProductModel.id,
+                    ProductFieldModel.field_tag == tag,
+                    ProductFieldModel.is_deleted.is_(False),
+                )
+                .limit(1)
+                .scalar_subquery()
+            )
+
+        flags_count = (
+            select(func.count(ProductFieldModel.id))
+            .where(
+                ProductFieldModel.product_id == ProductModel.id,
+                ProductFieldModel.is_deleted.is_(False),
+                ProductFieldModel.field_flag.is_not(None),
+                ProductFieldModel.field_flag != "",
+            )
+            .scalar_subquery()
+        )
+
+        src = select(
+            ProductModel.id,
+            _field_value("codigo_atual"),
+            _field_value("descricao"),
+            flags_count,
+            ProductModel.created_at,
+            ProductModel.updated_at,
+            func.coalesce(ProductModel.updated_at, ProductModel.created_at),
+            func.coalesce(ProductModel.is_deleted, False),
+        ).where(ProductModel.id == pid)
+
+        stmt = insert(ProductSummaryModel).from_select(
+            [
+                "product_id",
+                "codigo_atual",
+                "descricao",
+                "flags_count",
+                "created_at",
+                "updated_at",
+                "last_activity",
+                "is_deleted",
+            ],
+            src,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductSummaryModel.product_id],
+            set_={
+                "codigo_atual": stmt.excluded.codigo_atual,
+                "descricao": stmt.excluded.descricao,
+                "flags_count": stmt.excluded.flags_count,
+                "created_at": stmt.excluded.created_at,
+                "updated_at": stmt.excluded.updated_at,
+                "last_activity": stmt.excluded.last_activity,
+                "is_deleted": stmt.excluded.is_deleted,
+            },
+        )
+        self._session.execute(stmt)
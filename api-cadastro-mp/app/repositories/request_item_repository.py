@@ -1,7 +1,7 @@
 # app/repositories/request_item_repository.py
 
-from datetime import date
-from sqlalchemy import select, update, func, or_
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import select, update, func, or_, tuple_
 from sqlalchemy.orm import Session
 
 from app.core.base_repository import BaseRepository
@@ -36,6 +36,25 @@ class RequestItemRepository(BaseRepository[RequestItemModel]):
         )
         return list(self._session.execute(stmt).scalars().all())
 
+    def list_by_request_ids(self, request_ids: list[int]) -> dict[int, list[RequestItemModel]]:
+        """
+        Retorna um dict {request_id: [RequestItemModel, ...]} para as requests informadas.
+        """
+        if not request_ids:
+            return {}
+
+        stmt = (
+            select(RequestItemModel)
+            .where(RequestItemModel.request_id.in_(request_ids), RequestItemModel.is_deleted.is_(False))
+            .order_by(RequestItemModel.id.asc())
+        )
+        rows = list(self._session.execute(stmt).scalars().all())
+
+        grouped: dict[int, list[RequestItemModel]] = {}
+        for it in rows:
+            grouped.setdefault(it.request_id, []).append(it)
+        return grouped
+
     def update_fields(self, item_id: int, values: dict) -> bool:
         if not values:
             return True
@@ -87,6 +106,34 @@ class RequestItemRepository(BaseRepository[RequestItemModel]):
             return RequestItemModel.updated_at
         return func.coalesce(RequestItemModel.updated_at, RequestItemModel.created_at)
 
+    def _last_activity_col(self):
+        # mesma expressão do índice ix_ritem_last_activity
+        return func.coalesce(RequestItemModel.updated_at, RequestItemModel.created_at)
+
+    def _estimate_count(self, stmt) -> int | None:
+        """
+        Estimativa do planner (EXPLAIN) em vez de count(*) exato.
+        None se o plano não puder ser lido (quem chama cai no count exato).
+        """
+        # render_postcompile: IN/expanding viram binds comuns (sem __[POSTCOMPILE_...]);
+        # o compilador do dialeto já escapa "%" literal para o paramstyle do driver
+        compiled = stmt.compile(
+            dialect=self._session.get_bind().dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+        result = self._session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.construct_params()
+        )
+        try:
+            plan = result.scalar_one()
+            return max(0, int(plan[0]["Plan"]["Plan Rows"]))
+        except (LookupError, TypeError, ValueError):
+            return None
+
+    def _exact_count(self, stmt) -> int:
+        total_stmt = select(func.count()).select_from(stmt.subquery())
+        return int(self._session.execute(total_stmt).scalar_one())
+
     # -------- Listagem para tela --------
     def count_items(
         self,
@@ -135,8 +182,14 @@ class RequestItemRepository(BaseRepository[RequestItemModel]):
         date_from: date | None,
         date_to: date | None,
         date_mode: str,  # AUTO | CREATED | UPDATED
-    ) -> tuple[list[dict], int]:
-        """Lista RequestItems com contexto (request/message/conversation) para a UI."""
+        cursor: tuple[datetime, int] | None = None,
+        count_mode: str = "exact",  # exact | estimate | none
+    ) -> tuple[list[dict], int | None]:
+        """
+        Lista RequestItems com contexto (request/message/conversation) para a UI.
+        cursor = (coalesce(updated_at, created_at), id) do último item da página anterior
+        (paginação keyset; quando informado, offset é ignorado).
+        """
 
         target_dt_col = self._date_target_col(date_mode)
 
@@ -194,23 +247,37 @@ class RequestItemRepository(BaseRepository[RequestItemModel]):
             q = f"%{type_q.strip()}%"
             base_stmt = base_stmt.where(RequestTypeModel.type_name.ilike(q))
 
-        # range de datas (por dia, sem dor de timezone)
+        # range de datas (por dia) em faixa semiaberta [date_from 00:00, date_to+1 00:00)
+        # -> sargável: usa os índices de created_at/updated_at/last_activity
         if date_from is not None:
-            base_stmt = base_stmt.where(func.date(target_dt_col) >= date_from)
+            base_stmt = base_stmt.where(target_dt_col >= datetime.combine(date_from, time.min))
         if date_to is not None:
-            base_stmt = base_stmt.where(func.date(target_dt_col) <= date_to)
+            base_stmt = base_stmt.where(
+                target_dt_col < datetime.combine(date_to + timedelta(days=1), time.min)
+            )
 
-        total_stmt = select(func.count()).select_from(base_stmt.subquery())
-        total = int(self._session.execute(total_stmt).scalar_one())
+        total: int | None = None
+        if count_mode == "exact":
+            total = self._exact_count(base_stmt)
+        elif count_mode == "estimate":
+            total = self._estimate_count(base_stmt)
+            if total is None:
+                total = self._exact_count(base_stmt)
 
         # ordenação: mais recente (updated_at se existir, senão created_at)
-        sort_col = func.coalesce(RequestItemModel.updated_at, RequestItemModel.created_at)
+        sort_col = self._last_activity_col()
         base_stmt = base_stmt.order_by(sort_col.desc(), RequestItemModel.id.desc())
-        
+
+        if cursor is not None:
+            cursor_dt, cursor_id = cursor
+            base_stmt = base_stmt.where(
+                tuple_(sort_col, RequestItemModel.id) < tuple_(cursor_dt, int(cursor_id))
+            )
+
         if limit is not None:
             base_stmt = base_stmt.limit(int(limit))
 
-        if offset is not None:
+        if offset is not None and cursor is None:
             base_stmt = base_stmt.offset(int(offset))
 
         rows = self._session.execute(base_stmt).mappings().all()
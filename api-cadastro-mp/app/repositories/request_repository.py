@@ -44,6 +44,16 @@ class RequestRepository(BaseRepository[RequestModel]):
         rows = self._session.execute(stmt).scalars().all()
         return {r.message_id: r for r in rows}
 
+    def bump_version(self, request_id: int) -> int:
+        """Incrementa tbRequest.version de forma atômica e retorna o novo valor."""
+        stmt = (
+            update(RequestModel)
+            .where(RequestModel.id == request_id)
+            .values(version=RequestModel.version + 1)
+            .returning(RequestModel.version)
+        )
+        return int(self._session.execute(stmt).scalar_one())
+
     def soft_delete(self, request_id: int) -> bool:
         stmt = (
             update(RequestModel)
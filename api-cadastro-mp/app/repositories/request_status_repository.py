@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.base_repository import BaseRepository
+from app.infrastructure.cache.reference_cache import reference_cache, CachedRequestStatus
 from app.infrastructure.database.models.request_status_model import RequestStatusModel
 
 
@@ -11,17 +12,16 @@ class RequestStatusRepository(BaseRepository[RequestStatusModel]):
     def __init__(self, session: Session) -> None:
         super().__init__(session)
 
-    def get_map_by_ids(self, ids: list[int]) -> dict[int, RequestStatusModel]:
+    def get_map_by_ids(self, ids: list[int]) -> dict[int, CachedRequestStatus]:
+        """
+        Servido pelo cache em processo (tabela de seed), sem ida ao banco.
+        """
         ids = [int(x) for x in ids if x is not None]
         if not ids:
             return {}
 
-        stmt = select(RequestStatusModel).where(
-            RequestStatusModel.id.in_(ids),
-            RequestStatusModel.is_deleted.is_(False),
-        )
-        rows = list(self._session.execute(stmt).scalars().all())
-        return {int(r.id): r for r in rows}
+        cached = reference_cache.request_statuses(self._session)
+        return {i: cached[i] for i in ids if i in cached}
 
     def list_active(self) -> list[RequestStatusModel]:
         stmt = (
@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.base_repository import BaseRepository
+from app.infrastructure.cache.reference_cache import reference_cache, CachedRequestType
 from app.infrastructure.database.models.request_type_model import RequestTypeModel
 
 
@@ -11,17 +12,16 @@ class RequestTypeRepository(BaseRepository[RequestTypeModel]):
     def __init__(self, session: Session) -> None:
         super().__init__(session)
 
-    def get_map_by_ids(self, ids: list[int]) -> dict[int, RequestTypeModel]:
+    def get_map_by_ids(self, ids: list[int]) -> dict[int, CachedRequestType]:
+        """
+        Servido pelo cache em processo (tabela de seed), sem ida ao banco.
+        """
         ids = [int(x) for x in ids if x is not None]
         if not ids:
             return {}
 
-        stmt = select(RequestTypeModel).where(
-            RequestTypeModel.id.in_(ids),
-            RequestTypeModel.is_deleted.is_(False),
-        )
-        rows = list(self._session.execute(stmt).scalars().all())
-        return {int(r.id): r for r in rows}
+        cached = reference_cache.request_types(self._session)
+        return {i: cached[i] for i in ids if i in cached}
 
     def list_active(self) -> list[RequestTypeModel]:
         stmt = (
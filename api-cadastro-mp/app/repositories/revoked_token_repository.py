@@ -1,13 +1,16 @@
 # app/repositories/revoked_token_repository.py
 
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from app.core.base_repository import BaseRepository
 from app.infrastructure.database.models.revoked_token_model import RevokedTokenModel
 
+# canal LISTEN/NOTIFY usado para propagar revogações entre workers
+REVOKED_TOKENS_CHANNEL = "revoked_tokens"
+
 
 class RevokedTokenRepository(BaseRepository[RevokedTokenModel]):
     def __init__(self, session: Session) -> None:
@@ -16,8 +19,31 @@ class RevokedTokenRepository(BaseRepository[RevokedTokenModel]):
     def add(self, model: RevokedTokenModel) -> RevokedTokenModel:
         self._session.add(model)
         self._session.flush()
+
+        # ✅ NOTIFY é transacional: os outros workers só recebem após o commit
+        expires_at = model.expires_at
+        exp_ts = int(expires_at.replace(tzinfo=timezone.utc).timestamp()) if expires_at.tzinfo is None \
+            else int(expires_at.timestamp())
+        self._session.execute(
+            select(func.pg_notify(REVOKED_TOKENS_CHANNEL, f"{model.jti}|{exp_ts}"))
+        )
         return model
 
+    def list_active_since(self, *, after_id: int, now: datetime) -> list[tuple[int, str, datetime]]:
+        """
+        Revogações ainda não expiradas com id > after_id (delta sync do cache).
+        """
+        stmt = (
+            select(RevokedTokenModel.id, RevokedTokenModel.jti, RevokedTokenModel.expires_at)
+            .where(
+                RevokedTokenModel.id > int(after_id),
+                RevokedTokenModel.expires_at > now,
+                RevokedTokenModel.is_deleted.is_(False),
+            )
+            .order_by(RevokedTokenModel.id.asc())
+        )
+        return [(int(r.id), str(r.jti), r.expires_at) for r in self._session.execute(stmt).all()]
+
     def is_revoked(self, jti: str) -> bool:
         stmt = select(RevokedTokenModel.id).where(
             RevokedTokenModel.jti == jti,
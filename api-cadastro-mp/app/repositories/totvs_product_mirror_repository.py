@@ -0,0 +1,106 @@
+# app/repositories/totvs_product_mirror_repository.py
+
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.base_repository import BaseRepository
+from app.infrastructure.database.models.totvs_product_mirror_model import (
+    TotvsProductMirrorModel,
+    TotvsSyncStateModel,
+)
+
+# colunas no mesmo formato devolvido por TotvsProductRepository
+MIRROR_COLUMNS = (
+    "codigo",
+    "grupo",
+    "tipo",
+    "descricao",
+    "armazem_padrao",
+    "unidade",
+    "produto_terceiro",
+    "cta_contabil",
+    "ref_cliente",
+    "fornecedores",
+)
+
+
+def _mirror_rank(row: dict) -> tuple[bool, int]:
+    return (not bool(row.get("is_deleted", False)), int(row["totvs_recno"]))
+
+
+class TotvsProductMirrorRepository(BaseRepository[TotvsProductMirrorModel]):
+    def __init__(self, session: Session) -> None:
+        super().__init__(session)
+
+    def get_by_codes(self, codes: list[str]) -> dict[str, dict]:
+        """
+        Retorna {codigo: row} (mesmo formato do TOTVS) para os códigos presentes no espelho.
+        """
+        codes = [c for c in codes if c]
+        if not codes:
+            return {}
+
+        stmt = select(TotvsProductMirrorModel).where(
+            TotvsProductMirrorModel.codigo.in_(codes),
+            TotvsProductMirrorModel.is_deleted.is_(False),
+        )
+        return {
+            m.codigo: {c: getattr(m, c) for c in MIRROR_COLUMNS}
+            for m in self._session.execute(stmt).scalars()
+        }
+
+    def upsert_many(self, rows: list[dict], *, synced_at: datetime) -> int:
+        """
+        rows: dicts com MIRROR_COLUMNS + totvs_recno + is_deleted.
+        Código repetido no lote fica com uma linha (não deletada, depois maior recno):
+        o ON CONFLICT não aceita afetar a mesma linha duas vezes no mesmo comando.
+        """
+        best: dict[str, dict] = {}
+        for r in rows:
+            current = best.get(r["codigo"])
+            if current is None or _mirror_rank(r) > _mirror_rank(current):
+                best[r["codigo"]] = r
+        rows = list(best.values())
+
+        if not rows:
+            return 0
+
+        values = [
+            {
+                **{c: r.get(c) for c in MIRROR_COLUMNS},
+                "totvs_recno": int(r["totvs_recno"]),
+                "is_deleted": bool(r.get("is_deleted", False)),
+                "synced_at": synced_at,
+            }
+            for r in rows
+        ]
+
+        stmt = insert(TotvsProductMirrorModel).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TotvsProductMirrorModel.codigo],
+            set_={
+                **{c: stmt.excluded[c] for c in MIRROR_COLUMNS if c != "codigo"},
+                "totvs_recno": stmt.excluded.totvs_recno,
+                "is_deleted": stmt.excluded.is_deleted,
+                "synced_at": stmt.excluded.synced_at,
+            },
+        )
+        self._session.execute(stmt)
+        return len(values)
+
+    def get_sync_state(self, sync_name: str) -> TotvsSyncStateModel:
+        state = self._session.get(TotvsSyncStateModel, sync_name)
+        if state is None:
+            state = TotvsSyncStateModel(sync_name=sync_name, last_sb1_recno=0, last_sa5_recno=0)
+            self._session.add(state)
+            self._session.flush()
+        return state
+
+    def get_last_synced_at(self, sync_name: str) -> datetime | None:
+        stmt = select(TotvsSyncStateModel.last_synced_at).where(
+            TotvsSyncStateModel.sync_name == sync_name
+        )
+        return self._session.execute(stmt).scalar_one_or_none()
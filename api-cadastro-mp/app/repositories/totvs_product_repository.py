@@ -1,50 +1,248 @@
 # app/repositories/totvs_product_repository.py
-from sqlalchemy import text
-from app.infrastructure.database.totvs_connection import TotvsSessionLocal
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, text
+
+from app.config.settings import settings
+from app.infrastructure.cache.ttl_lru_cache import TtlLruCache
+from app.infrastructure.database.totvs_connection import run_totvs
+from app.repositories.totvs_product_mirror_repository import TotvsProductMirrorRepository
+
+
+# SQL Server aceita no máximo 2100 parâmetros por comando; lotes bem abaixo disso
+_BATCH_CHUNK_SIZE = 500
+
+# ✅ cache por código de produto (compartilhado pelo processo)
+_products_by_code_cache = TtlLruCache(
+    max_entries=settings.totvs_cache_max_entries,
+    ttl_seconds=settings.totvs_cache_ttl_seconds,
+    negative_ttl_seconds=settings.totvs_cache_negative_ttl_seconds,
+)
+
+
+MIRROR_SYNC_NAME = "products"
+
+_PRODUCT_SELECT = """
+    SELECT
+        LTRIM(RTRIM(B1_COD))       AS codigo,
+        LTRIM(RTRIM(B1_GRUPO))     AS grupo,
+        LTRIM(RTRIM(B1_TIPO))      AS tipo,
+        LTRIM(RTRIM(B1_DESC))      AS descricao,
+        LTRIM(RTRIM(B1_LOCPAD))    AS armazem_padrao,
+        LTRIM(RTRIM(B1_UM))        AS unidade,
+        LTRIM(RTRIM(B1_TPMAT))     AS produto_terceiro,
+        LTRIM(RTRIM(B1_CONTA))     AS cta_contabil,
+        LTRIM(RTRIM(B1_REFEREN))   AS ref_cliente,
+
+        (
+            SELECT
+                LTRIM(RTRIM(A5_FORNECE))  AS supplier_code,
+                LTRIM(RTRIM(A5_LOJA))     AS store,
+                LTRIM(RTRIM(A5_NOMEFOR))  AS supplier_name,
+                LTRIM(RTRIM(A5_CODPRF))   AS part_number,
+                LTRIM(RTRIM(A5_CODPRCA))   AS catalog_number
+            FROM SA5010
+            WHERE
+                SA5010.D_E_L_E_T_ = ''
+                AND SA5010.A5_PRODUTO = SB1010.B1_COD
+            FOR JSON PATH
+        ) AS fornecedores
+"""
 
 
 class TotvsProductRepository:
-    def list_products(self, *, code: str | None = None) -> list[dict]:
-        with TotvsSessionLocal() as session:
-            sql = """
-                SELECT 
-                    LTRIM(RTRIM(B1_COD))       AS codigo,
-                    LTRIM(RTRIM(B1_GRUPO))     AS grupo,
-                    LTRIM(RTRIM(B1_TIPO))      AS tipo,
-                    LTRIM(RTRIM(B1_DESC))      AS descricao,
-                    LTRIM(RTRIM(B1_LOCPAD))    AS armazem_padrao,
-                    LTRIM(RTRIM(B1_UM))        AS unidade,
-                    LTRIM(RTRIM(B1_TPMAT))     AS produto_terceiro,
-                    LTRIM(RTRIM(B1_CONTA))     AS cta_contabil,
-                    LTRIM(RTRIM(B1_REFEREN))   AS ref_cliente,
-
-                    (
-                        SELECT
-                            LTRIM(RTRIM(A5_FORNECE))  AS supplier_code,
-                            LTRIM(RTRIM(A5_LOJA))     AS store,
-                            LTRIM(RTRIM(A5_NOMEFOR))  AS supplier_name,
-                            LTRIM(RTRIM(A5_CODPRF))   AS part_number,
-                            LTRIM(RTRIM(A5_CODPRCA))   AS catalog_number
-                        FROM SA5010
-                        WHERE
-                            SA5010.D_E_L_E_T_ = ''
-                            AND SA5010.A5_PRODUTO = SB1010.B1_COD
-                        FOR JSON PATH
-                    ) AS fornecedores
-
-                FROM SB1010
-                WHERE SB1010.D_E_L_E_T_ = ''
-            """
+    def __init__(self, mirror_repo: TotvsProductMirrorRepository | None = None) -> None:
+        # espelho local (PostgreSQL), usado quando TOTVS_READ_MODE=mirror
+        self._mirror_repo = mirror_repo
+
+    def _read_mirror(self, codes: list[str]) -> dict[str, dict]:
+        """
+        Lê do espelho local se o modo for "mirror" e a última sincronização
+        estiver dentro de TOTVS_MIRROR_MAX_AGE_SECONDS. Caso contrário, {}.
+        """
+        if settings.totvs_read_mode != "mirror" or self._mirror_repo is None:
+            return {}
+
+        last_synced_at = self._mirror_repo.get_last_synced_at(MIRROR_SYNC_NAME)
+        if last_synced_at is None:
+            return {}
+
+        age = (datetime.now(timezone.utc) - last_synced_at).total_seconds()
+        if age > settings.totvs_mirror_max_age_seconds:
+            return {}
+
+        return self._mirror_repo.get_by_codes(codes)
+
+    def list_products(self, *, code: str | None = None, fresh: bool = False) -> list[dict]:
+        """
+        Com `code`: espelho local (se habilitado e atualizado) ou cache (TTL + LRU,
+        inclusive "não encontrado") com fallback ao TOTVS.
+        fresh=True força a ida ao TOTVS e atualiza o cache (ex.: finalização).
+        Sem `code`: lista completa, sempre direto no TOTVS.
+        """
+        code = (code or "").strip() or None
+        if code is None:
+            return self._query_products(codes=None)
+
+        if not fresh:
+            mirrored = self._read_mirror([code])
+            if code in mirrored:
+                return [mirrored[code]]
+
+        return _products_by_code_cache.get_or_load(
+            code,
+            lambda: self._query_products(codes=[code]),
+            fresh=fresh,
+        )
 
-            params = {}
-            if code:
-                sql += " AND SB1010.B1_COD = :code"
-                params["code"] = code.strip()
+    def list_products_by_codes(self, codes: list[str], *, fresh: bool = False) -> dict[str, dict | None]:
+        """
+        Busca vários produtos (com fornecedores) de uma vez.
+        Retorna {codigo_solicitado: row | None}; usa o mesmo cache do list_products
+        e só consulta o TOTVS os códigos ausentes, em lotes de _BATCH_CHUNK_SIZE.
+        """
+        wanted: list[str] = []
+        for c in codes or []:
+            c = (c or "").strip()
+            if c and c not in wanted:
+                wanted.append(c)
 
-            result = session.execute(text(sql), params)
-            rows = [dict(row._mapping) for row in result]
-            return [_deep_strip(r) for r in rows]
+        out: dict[str, dict | None] = {}
+        missing: list[str] = []
 
+        if not fresh:
+            out.update(self._read_mirror(wanted))
+
+        _absent = object()
+        for c in wanted:
+            if c in out:
+                continue
+            cached = _absent if fresh else _products_by_code_cache.get(c, _absent)
+            if cached is _absent:
+                missing.append(c)
+            else:
+                out[c] = cached[0] if cached else None
+
+        for i in range(0, len(missing), _BATCH_CHUNK_SIZE):
+            chunk = missing[i:i + _BATCH_CHUNK_SIZE]
+            rows = self._query_products(codes=chunk)
+
+            # B1_COD compara sem diferenciar maiúsculas (collation do TOTVS)
+            by_code = {str(r.get("codigo") or "").upper(): r for r in rows}
+            for c in chunk:
+                row = by_code.get(c.upper())
+                _products_by_code_cache.set(c, [row] if row else [])
+                out[c] = row
+
+        return {c: out.get(c) for c in wanted}
+
+    def invalidate_cache(self, code: str | None = None) -> None:
+        """Remove um código do cache (ou tudo, se code=None)."""
+        _products_by_code_cache.invalidate((code or "").strip() or None)
+
+    def cache_stats(self) -> dict[str, int]:
+        return _products_by_code_cache.stats()
+
+    def _query_products(self, *, codes: list[str] | None) -> list[dict]:
+        sql = f"""
+            {_PRODUCT_SELECT}
+            FROM SB1010
+            WHERE SB1010.D_E_L_E_T_ = ''
+        """
+
+        stmt = text(sql)
+        params = {}
+        if codes:
+            sql += " AND SB1010.B1_COD IN :codes"
+            stmt = text(sql).bindparams(bindparam("codes", expanding=True))
+            params["codes"] = list(codes)
+
+        rows = run_totvs(
+            lambda session: [dict(row._mapping) for row in session.execute(stmt, params)]
+        )
+        return [_deep_strip(r) for r in rows]
+
+    # ---------------- Sincronização do espelho (scripts/sync_totvs_products.py) ----------------
+    def list_product_changes(self, *, after_recno: int, limit: int) -> tuple[list[dict], int]:
+        """
+        Próximo lote de SB1010 por R_E_C_N_O_ (inclui deletados, para refletir no espelho).
+        Retorna (linhas_para_o_espelho, maior_recno_visto); uma linha por código
+        (ver list_product_rows_for_mirror). Não passa pelo cache.
+        """
+        sql = """
+            SELECT
+                LTRIM(RTRIM(B1_COD)) AS codigo,
+                R_E_C_N_O_           AS recno
+            FROM SB1010
+            WHERE R_E_C_N_O_ > :after_recno
+            ORDER BY R_E_C_N_O_
+            OFFSET 0 ROWS FETCH NEXT :limit ROWS ONLY
+        """
+        params = {"after_recno": int(after_recno), "limit": int(limit)}
+
+        rows = run_totvs(lambda session: session.execute(text(sql), params).all())
+        if not rows:
+            return [], int(after_recno)
+
+        codes = list(dict.fromkeys(str(r.codigo) for r in rows if r.codigo))
+        return self.list_product_rows_for_mirror(codes), int(rows[-1].recno)
+
+    def list_products_with_supplier_changes(self, *, after_recno: int, limit: int) -> tuple[list[str], int]:
+        """
+        Códigos de produto cujos fornecedores (SA5010) mudaram depois de `after_recno`.
+        Retorna (codigos, maior_recno_visto); codigos pode vir vazio com o recno avançado.
+        """
+        sql = """
+            SELECT TOP (:limit)
+                LTRIM(RTRIM(A5_PRODUTO)) AS codigo,
+                R_E_C_N_O_               AS recno
+            FROM SA5010
+            WHERE R_E_C_N_O_ > :after_recno
+            ORDER BY R_E_C_N_O_
+        """
+        params = {"after_recno": int(after_recno), "limit": int(limit)}
+
+        rows = run_totvs(lambda session: session.execute(text(sql), params).all())
+        if not rows:
+            return [], int(after_recno)
+
+        codes = list(dict.fromkeys(str(r.codigo) for r in rows if r.codigo))
+        return codes, int(rows[-1].recno)
+
+    def list_product_rows_for_mirror(self, codes: list[str]) -> list[dict]:
+        """
+        Linhas completas (com R_E_C_N_O_) de SB1010 para os códigos informados.
+        Um código excluído e recriado tem várias linhas: fica só uma por código,
+        a não deletada e, entre iguais, o maior R_E_C_N_O_.
+        """
+        out: list[dict] = []
+        for i in range(0, len(codes), _BATCH_CHUNK_SIZE):
+            chunk = codes[i:i + _BATCH_CHUNK_SIZE]
+            sql = f"""
+                SELECT * FROM (
+                    {_PRODUCT_SELECT},
+                        SB1010.R_E_C_N_O_ AS totvs_recno,
+                        CASE WHEN SB1010.D_E_L_E_T_ = '*' THEN 1 ELSE 0 END AS is_deleted,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY SB1010.B1_COD
+                            ORDER BY
+                                CASE WHEN SB1010.D_E_L_E_T_ = '*' THEN 1 ELSE 0 END,
+                                SB1010.R_E_C_N_O_ DESC
+                        ) AS rn
+                    FROM SB1010
+                    WHERE SB1010.B1_COD IN :codes
+                ) ranked
+                WHERE ranked.rn = 1
+            """
+            stmt = text(sql).bindparams(bindparam("codes", expanding=True))
+            params = {"codes": chunk}
+            rows = run_totvs(
+                lambda session: [dict(row._mapping) for row in session.execute(stmt, params)]
+            )
+            for r in rows:
+                r.pop("rn", None)
+                out.append(_deep_strip(r))
+        return out
 
 def _deep_strip(value):
     if isinstance(value, str):
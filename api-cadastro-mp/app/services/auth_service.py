@@ -3,6 +3,7 @@
 from datetime import datetime, timezone
 
 from app.core.exceptions import UnauthorizedError
+from app.infrastructure.cache.revoked_token_cache import revoked_token_cache
 from app.infrastructure.database.models.revoked_token_model import RevokedTokenModel
 from app.infrastructure.security.jwt_provider import JwtProvider
 from app.repositories.revoked_token_repository import RevokedTokenRepository
@@ -39,5 +40,8 @@ class AuthService:
         )
         self._revoked_repo.add(model)
 
+        # ✅ vale imediatamente neste worker (os demais recebem via NOTIFY)
+        revoked_token_cache.add(str(jti), int(exp))
+
     def is_token_revoked(self, *, jti: str) -> bool:
         return self._revoked_repo.is_revoked(jti=jti)
@@ -16,7 +16,6 @@ from app.repositories.message_file_repository import MessageFileRepository
 from app.repositories.request_repository import RequestRepository
 from app.repositories.message_type_repository import MessageTypeRepository
 
-from app.infrastructure.realtime.socketio_server import socketio
 from app.core.interfaces.message_notifier import MessageNotifier, MessageCreatedEvent
 
 from app.services.request_service import RequestService
@@ -213,7 +212,7 @@ class MessageService:
         create_request: bool,
         request_items: list[dict] | None = None,
     ) -> MessageModel:
-        self._ensure_access(conversation_id=conversation_id, user_id=user_id, role_id=role_id)
+        conv = self._ensure_access(conversation_id=conversation_id, user_id=user_id, role_id=role_id)
 
         # garante participant (pra leitura funcionar)
         self._part_repo.ensure(conversation_id=conversation_id, user_id=user_id)
@@ -286,6 +285,17 @@ class MessageService:
 
         self._conv_repo.touch(conversation_id)
 
+        # ✅ contadores de não lidas dos demais participantes (+1)
+        unread_counts = self._part_repo.increment_unread(conversation_id=conversation_id, sender_id=user_id)
+        if unread_counts:
+            self._notifier.notify_unread_changed(conversation_id=conversation_id, unread_counts=unread_counts)
+
+        # ninguém conectado receberia o message:new: não monta o payload
+        if not self._notifier.has_audience(
+            conversation_id=conversation_id, conversation_owner_id=int(conv.created_by)
+        ):
+            return msg
+
         # ✅ payload JSON-safe para socket (inclui request_full quando houver)
         message_payload = self._pack_message_payload_realtime(
             conversation_id=conversation_id,
@@ -319,36 +329,29 @@ class MessageService:
             # ✅ agora é JSON-safe (não quebra socket)
             message=message_payload,
             sender=message_payload.get("sender"),
+            conversation_owner_id=int(conv.created_by),
         )
 
         self._notifier.notify_message_created(event)
         return msg
 
-    def list_messages(self, *, conversation_id: int, user_id: int, role_id: int):
-        """
-        ⚠️ Mantido igual (retorna models), para não quebrar as rotas atuais.
-        """
-        self._ensure_access(conversation_id=conversation_id, user_id=user_id, role_id=role_id)
-
-        participant = self._part_repo.ensure(conversation_id=conversation_id, user_id=user_id)
-        rows = self._msg_repo.list_rows_by_conversation(conversation_id=conversation_id)
-
+    def _pack_rows(self, *, conversation_id: int, rows: list, participant, user_id: int, role_id: int) -> list[dict]:
         message_ids = [msg.id for (msg, _sender) in rows]
         files_map = self._file_repo.list_by_message_ids(message_ids)
         req_map = self._req_repo.get_by_message_ids(message_ids)
 
+        # request_full de todas as mensagens da página em lote (evita N+1)
+        request_full_map = self._req_service.get_requests_for_conversation(
+            conversation_id=conversation_id,
+            requests=list(req_map.values()),
+            user_id=user_id,
+            role_id=role_id,
+        )
+
         out = []
         for msg, sender in rows:
             req = req_map.get(msg.id)
-
-            request_full = None
-            if req is not None:
-                req2, items2, fields_map, type_map, status_map = self._req_service.get_request(
-                    request_id=req.id,
-                    user_id=user_id,
-                    role_id=role_id,
-                )
-                request_full = (req2, items2, fields_map, type_map, status_map)
+            request_full = request_full_map.get(int(req.id)) if req is not None else None
 
             out.append(
                 {
@@ -366,6 +369,65 @@ class MessageService:
 
         return out
 
+    def list_messages(self, *, conversation_id: int, user_id: int, role_id: int):
+        """
+        ⚠️ Mantido igual (retorna models), para não quebrar as rotas atuais.
+        """
+        self._ensure_access(conversation_id=conversation_id, user_id=user_id, role_id=role_id)
+
+        participant = self._part_repo.ensure(conversation_id=conversation_id, user_id=user_id)
+        rows = self._msg_repo.list_rows_by_conversation(conversation_id=conversation_id)
+
+        return self._pack_rows(
+            conversation_id=conversation_id,
+            rows=rows,
+            participant=participant,
+            user_id=user_id,
+            role_id=role_id,
+        )
+
+    def list_messages_page(
+        self,
+        *,
+        conversation_id: int,
+        user_id: int,
+        role_id: int,
+        limit: int,
+        before_id: int | None = None,
+        after_id: int | None = None,
+    ) -> tuple[list[dict], int | None, bool]:
+        """
+        Paginação por cursor (keyset) das mensagens.
+        Retorna (items em ordem id ASC, next_cursor, has_more).
+        next_cursor é o menor id da página (para before_id) ou o maior (para after_id).
+        """
+        if before_id is not None and after_id is not None:
+            raise ConflictError("Informe apenas before_id ou after_id.")
+
+        self._ensure_access(conversation_id=conversation_id, user_id=user_id, role_id=role_id)
+
+        participant = self._part_repo.ensure(conversation_id=conversation_id, user_id=user_id)
+        rows, has_more = self._msg_repo.list_rows_page_by_conversation(
+            conversation_id=conversation_id,
+            limit=limit,
+            before_id=before_id,
+            after_id=after_id,
+        )
+
+        next_cursor = None
+        if rows and has_more:
+            edge_msg, _sender = rows[-1] if after_id is not None else rows[0]
+            next_cursor = int(edge_msg.id)
+
+        items = self._pack_rows(
+            conversation_id=conversation_id,
+            rows=rows,
+            participant=participant,
+            user_id=user_id,
+            role_id=role_id,
+        )
+        return items, next_cursor, has_more
+
     def get_message(self, *, conversation_id: int, message_id: int, user_id: int, role_id: int):
         """
         ⚠️ Mantido igual (retorna models), para não quebrar as rotas atuais.
@@ -424,6 +486,13 @@ class MessageService:
         if not ok:
             raise NotFoundError("Mensagem não encontrada.")
 
+        # quem ainda não tinha lido a mensagem perde uma pendência
+        unread_counts = self._part_repo.decrement_unread(
+            conversation_id=conversation_id, message_id=message_id, sender_id=msg.sender_id
+        )
+        if unread_counts:
+            self._notifier.notify_unread_changed(conversation_id=conversation_id, unread_counts=unread_counts)
+
         self._conv_repo.touch(conversation_id)
 
     def mark_read(self, *, conversation_id: int, user_id: int, role_id: int, message_ids: list[int]) -> int:
@@ -437,15 +506,17 @@ class MessageService:
         if max_id is None:
             return 0
 
-        self._part_repo.set_last_read(conversation_id=conversation_id, user_id=user_id, last_read_message_id=max_id)
+        unread_count = self._part_repo.set_last_read(
+            conversation_id=conversation_id, user_id=user_id, last_read_message_id=max_id
+        )
+
+        # sincroniza o contador nas outras abas/dispositivos do usuário
+        if unread_count is not None:
+            self._notifier.notify_unread_changed(
+                conversation_id=conversation_id, unread_counts={user_id: int(unread_count)}
+            )
 
-        socketio.emit(
-            "message:read",
-            {
-                "conversation_id": conversation_id,
-                "user_id": user_id,
-                "last_read_message_id": max_id,
-            },
-            room=f"conversation:{conversation_id}",
+        self._notifier.notify_messages_read(
+            conversation_id=conversation_id, user_id=user_id, last_read_message_id=max_id
         )
         return 1
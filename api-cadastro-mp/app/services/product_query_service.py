@@ -1,6 +1,6 @@
 # app/services/product_query_service.py
 from datetime import datetime, timedelta
-from sqlalchemy import select, func, exists, and_
+from sqlalchemy import select, func, or_
 from sqlalchemy.orm import Session
 
 import json
@@ -8,6 +8,7 @@ import json
 from app.core.exceptions import NotFoundError, ConflictError
 from app.infrastructure.database.models.product_model import ProductModel
 from app.infrastructure.database.models.product_field_model import ProductFieldModel
+from app.infrastructure.database.models.product_summary_model import ProductSummaryModel
 
 from app.repositories.totvs_product_repository import TotvsProductRepository
 
@@ -32,62 +33,49 @@ class ProductQueryService:
         flag: str = "all",  # all | with | without
         date_from: str | None = None,
         date_to: str | None = None,
+        sort: str = "recent",  # recent | relevance (com q)
     ) -> tuple[list[dict], int]:
 
-        base = select(ProductModel).where(ProductModel.is_deleted.is_(False))
+        # ✅ tudo em tbProductSummary (mantida na escrita): um scan indexado por página
+        S = ProductSummaryModel
+        base = select(S).where(S.is_deleted.is_(False))
 
         # --------------------------------------------------
         # filtro por flag (antes da paginação)
         # --------------------------------------------------
-        flag_predicate = exists(
-            select(1).where(
-                and_(
-                    ProductFieldModel.product_id == ProductModel.id,
-                    ProductFieldModel.is_deleted.is_(False),
-                    ProductFieldModel.field_flag.is_not(None),
-                    ProductFieldModel.field_flag != "",
-                )
-            )
-        )
-
         if flag == "with":
-            base = base.where(flag_predicate)
+            base = base.where(S.flags_count > 0)
         elif flag == "without":
-            base = base.where(~flag_predicate)
+            base = base.where(S.flags_count == 0)
 
         # --------------------------------------------------
         # filtro por data
         # --------------------------------------------------
         if date_from:
             dt_from = self._parse_date(date_from)
-            base = base.where(
-                func.coalesce(ProductModel.updated_at, ProductModel.created_at) >= dt_from
-            )
+            base = base.where(S.last_activity >= dt_from)
 
         if date_to:
             dt_to = self._parse_date(date_to) + timedelta(days=1)
-            base = base.where(
-                func.coalesce(ProductModel.updated_at, ProductModel.created_at) < dt_to
-            )
+            base = base.where(S.last_activity < dt_to)
 
         # --------------------------------------------------
         # 🔥 filtro por texto (codigo_atual / descricao) NO SQL
         # --------------------------------------------------
+        # (ix_psummary_search_trgm: GIN pg_trgm nas duas colunas)
+        rank_col = None
         if q and q.strip():
-            qq = f"%{q.strip()}%"
-
-            text_predicate = exists(
-                select(1).where(
-                    and_(
-                        ProductFieldModel.product_id == ProductModel.id,
-                        ProductFieldModel.is_deleted.is_(False),
-                        ProductFieldModel.field_tag.in_(["codigo_atual", "descricao"]),
-                        ProductFieldModel.field_value.ilike(qq),
-                    )
-                )
-            )
+            qs = q.strip()
+            qq = f"%{qs}%"
+
+            base = base.where(or_(S.codigo_atual.ilike(qq), S.descricao.ilike(qq)))
 
-            base = base.where(text_predicate)
+            # relevância: melhor similaridade (pg_trgm) entre codigo_atual/descricao e q
+            if sort == "relevance":
+                rank_col = func.greatest(
+                    func.word_similarity(qs, func.coalesce(S.codigo_atual, "")),
+                    func.word_similarity(qs, func.coalesce(S.descricao, "")),
+                )
 
         # --------------------------------------------------
         # total (antes da paginação)
@@ -98,10 +86,11 @@ class ProductQueryService:
         # --------------------------------------------------
         # paginação (por último)
         # --------------------------------------------------
-        page = base.order_by(
-            func.coalesce(ProductModel.updated_at, ProductModel.created_at).desc(),
-            ProductModel.id.desc(),
-        )
+        order_by = [S.last_activity.desc(), S.product_id.desc()]
+        if rank_col is not None:
+            order_by.insert(0, rank_col.desc())
+
+        page = base.order_by(*order_by)
 
         if limit is not None:
             page = page.limit(int(limit))
@@ -109,62 +98,22 @@ class ProductQueryService:
         if offset is not None:
             page = page.offset(int(offset))
 
-        products = list(self._session.execute(page).scalars().all())
-        pids = [int(p.id) for p in products]
-
-        # --------------------------------------------------
-        # campos básicos (codigo_atual / descricao)
-        # --------------------------------------------------
-        fields = []
-        if pids:
-            stmtf = (
-                select(ProductFieldModel)
-                .where(
-                    ProductFieldModel.product_id.in_(pids),
-                    ProductFieldModel.is_deleted.is_(False),
-                    ProductFieldModel.field_tag.in_(["codigo_atual", "descricao"]),
-                )
-            )
-            fields = list(self._session.execute(stmtf).scalars().all())
-
-        by_pid: dict[int, dict[str, str | None]] = {}
-        for f in fields:
-            by_pid.setdefault(int(f.product_id), {})[f.field_tag] = f.field_value
-
-        # --------------------------------------------------
-        # contagem de flags por produto
-        # --------------------------------------------------
-        flags_by_pid: dict[int, int] = {}
-        if pids:
-            flags_stmt = (
-                select(ProductFieldModel.product_id, func.count(ProductFieldModel.id))
-                .where(
-                    ProductFieldModel.product_id.in_(pids),
-                    ProductFieldModel.is_deleted.is_(False),
-                    ProductFieldModel.field_flag.is_not(None),
-                    ProductFieldModel.field_flag != "",
-                )
-                .group_by(ProductFieldModel.product_id)
-            )
-            for product_id, total_flags in self._session.execute(flags_stmt).all():
-                flags_by_pid[int(product_id)] = int(total_flags)
+        summaries = list(self._session.execute(page).scalars().all())
 
         # --------------------------------------------------
         # payload final
         # --------------------------------------------------
-        rows: list[dict] = []
-        for p in products:
-            d = by_pid.get(int(p.id), {})
-            rows.append(
-                {
-                    "id": int(p.id),
-                    "created_at": p.created_at,
-                    "updated_at": p.updated_at,
-                    "codigo_atual": d.get("codigo_atual"),
-                    "descricao": d.get("descricao"),
-                    "flags_count": flags_by_pid.get(int(p.id), 0),
-                }
-            )
+        rows: list[dict] = [
+            {
+                "id": int(r.product_id),
+                "created_at": r.created_at,
+                "updated_at": r.updated_at,
+                "codigo_atual": r.codigo_atual,
+                "descricao": r.descricao,
+                "flags_count": int(r.flags_count or 0),
+            }
+            for r in summaries
+        ]
 
         return rows, total
 
@@ -190,17 +139,7 @@ class ProductQueryService:
         )
         return p, fields
     
-    def get_product_totvs(self, *, product_code: str) -> dict:
-        code = (product_code or "").strip()
-        if not code:
-            raise NotFoundError("Código do produto não informado.")
-
-        rows = self._totvs_prod_repo.list_products(code=code)
-        if not rows:
-            raise NotFoundError("Produto não encontrado no TOTVS.")
-
-        item = rows[0]
-
+    def _normalize_totvs_row(self, item: dict) -> dict:
         # 'fornecedores' vem como JSON string (FOR JSON PATH). Vamos normalizar.
         fornecedores_raw = item.get("fornecedores")
         if isinstance(fornecedores_raw, str) and fornecedores_raw.strip():
@@ -213,3 +152,31 @@ class ProductQueryService:
             item["fornecedores"] = []
 
         return item
+
+    def get_product_totvs(self, *, product_code: str) -> dict:
+        code = (product_code or "").strip()
+        if not code:
+            raise NotFoundError("Código do produto não informado.")
+
+        rows = self._totvs_prod_repo.list_products(code=code)
+        if not rows:
+            raise NotFoundError("Produto não encontrado no TOTVS.")
+
+        return self._normalize_totvs_row(rows[0])
+
+    def get_products_totvs(self, *, product_codes: list[str]) -> tuple[dict[str, dict], list[str]]:
+        """
+        Consulta vários códigos no TOTVS em uma ida só.
+        Retorna ({codigo: produto}, [codigos_nao_encontrados]).
+        """
+        rows_by_code = self._totvs_prod_repo.list_products_by_codes(product_codes)
+
+        found: dict[str, dict] = {}
+        not_found: list[str] = []
+        for code, row in rows_by_code.items():
+            if row is None:
+                not_found.append(code)
+            else:
+                found[code] = self._normalize_totvs_row(row)
+
+        return found, not_found
@@ -160,7 +160,8 @@ class ProductService:
         if not self._totvs_repo:
             raise ConflictError("Integração TOTVS não configurada no ProductService.")
 
-        totvs_rows = self._totvs_repo.list_products(code=lookup_code)
+        # ✅ finalização sempre lê o TOTVS atualizado (ignora o cache)
+        totvs_rows = self._totvs_repo.list_products(code=lookup_code, fresh=True)
         if not totvs_rows:
             raise ConflictError(f"Produto '{lookup_code}' não encontrado no TOTVS. Não é possível finalizar.")
 
@@ -254,6 +255,8 @@ class ProductService:
         )
 
         self._product_repo.touch_updated_at(product_id)
+        # ✅ mantém tbProductSummary (listagem) na mesma transação
+        self._product_repo.refresh_summary(product_id)
         self._item_repo.update_fields(int(item.id), {"product_id": product_id})
 
         # Descrição: prefira TOTVS (real), fallback request
@@ -318,6 +321,7 @@ class ProductService:
             raise NotFoundError("Campo do produto não encontrado.")
 
         self._product_repo.touch_updated_at(int(pf.product_id))
+        self._product_repo.refresh_summary(int(pf.product_id))
 
         # 🔔 Notificação realtime (flag)
         if self._product_notifier:
@@ -18,8 +18,11 @@ class RefreshTokenService:
         self._jwt = jwt_provider
         self._repo = repo
 
-    def store_refresh_token(self, *, user_id: int, refresh_token: str) -> RefreshTokenModel:
-        claims = self._jwt.decode(refresh_token)
+    def store_refresh_token(
+        self, *, user_id: int, refresh_token: str, claims: dict | None = None
+    ) -> RefreshTokenModel:
+        # claims: quando o token acabou de ser emitido, evita decodificar de novo
+        claims = claims or self._jwt.decode(refresh_token)
         if claims.get("typ") != "refresh":
             raise UnauthorizedError("Token inválido.")
 
@@ -57,14 +60,13 @@ class RefreshTokenService:
 
         user_id = stored.user_id
 
-        new_refresh = self._jwt.issue_refresh_token(subject=str(user_id))
-        new_claims = self._jwt.decode(new_refresh)
+        new_refresh, new_claims = self._jwt.issue_refresh_token_with_claims(subject=str(user_id))
 
         # revoga o antigo e vincula ao novo
         self._repo.revoke(token_id=stored.id, reason="rotated", replaced_by_jti=str(new_claims["jti"]))
 
         # grava o novo
-        self.store_refresh_token(user_id=user_id, refresh_token=new_refresh)
+        self.store_refresh_token(user_id=user_id, refresh_token=new_refresh, claims=new_claims)
 
         return user_id, new_refresh
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from enum import IntEnum
 from typing import Optional, Any
-from datetime import timezone, date
+from datetime import timezone, date, datetime
 
 from app.core.exceptions import ForbiddenError, NotFoundError, ConflictError
 from app.infrastructure.database.models.request_model import RequestModel
@@ -77,16 +77,20 @@ class RequestService:
         self._totvs_repo = totvs_repo
         self._notifier = notifier
 
+        # conversation_id -> created_by (preenchido pelo check de acesso; usado nos eventos)
+        self._conversation_owners: dict[int, int] = {}
+
     # ---------------- Realtime payload builder ----------------
     def _iso(self, dt) -> str | None:
         if not dt:
             return None
         return dt.astimezone(timezone.utc).isoformat()
 
-    def _pack_request_full(self, req: RequestModel) -> dict[str, Any]:
+    def _load_request_graph(self, req: RequestModel) -> tuple[list, dict, dict, dict]:
         """
-        Monta um payload "completo" do request (similar ao GET /api/requests/<id>),
-        sem depender da camada API/schemas (mantém camadas).
+        Carrega (uma única vez) items + fields + types + status do request.
+        Retorna (items, fields_map, type_map, status_map), reutilizado pelos payloads
+        de request e de item no mesmo evento.
         """
         items = self._item_repo.list_by_request_id(req.id)
         item_ids = [int(i.id) for i in items]
@@ -100,82 +104,26 @@ class RequestService:
         type_map = self._type_repo.get_map_by_ids(type_ids)
         status_map = self._status_repo.get_map_by_ids(status_ids)
 
-        payload_items: list[dict[str, Any]] = []
-        for it in items:
-            t = type_map.get(int(it.request_type_id)
-                             ) if it.request_type_id is not None else None
-            s = status_map.get(int(it.request_status_id)
-                               ) if it.request_status_id is not None else None
-            f_list = fields_map.get(int(it.id), []) or []
-
-            payload_items.append(
-                {
-                    "id": int(it.id),
-                    "request_id": int(it.request_id),
-                    "request_type_id": int(it.request_type_id) if it.request_type_id is not None else None,
-                    "request_status_id": int(it.request_status_id) if it.request_status_id is not None else None,
-                    "request_type": (
-                        {"id": int(t.id), "type_name": str(
-                            getattr(t, "type_name", None))}
-                        if t is not None
-                        else None
-                    ),
-                    "request_status": (
-                        {"id": int(s.id), "status_name": str(
-                            getattr(s, "status_name", None))}
-                        if s is not None
-                        else None
-                    ),
-                    "product_id": int(it.product_id) if it.product_id is not None else None,
-                    "created_at": self._iso(it.created_at),
-                    "updated_at": self._iso(it.updated_at),
-                    "fields": [
-                        {
-                            "id": int(f.id),
-                            "request_items_id": int(f.request_items_id),
-                            "field_type_id": int(f.field_type_id) if f.field_type_id is not None else None,
-                            "field_tag": str(f.field_tag),
-                            "field_value": f.field_value,
-                            "field_flag": f.field_flag,
-                            "created_at": self._iso(f.created_at),
-                            "updated_at": self._iso(f.updated_at),
-                        }
-                        for f in f_list
-                        if not (getattr(f, "is_deleted", False) or False)
-                    ],
-                }
-            )
-
-        return {
-            "id": int(req.id),
-            "message_id": int(req.message_id),
-            "created_by": int(req.created_by),
-            "created_at": self._iso(req.created_at),
-            "updated_at": self._iso(req.updated_at),
-            "items": payload_items,
-        }
-
-    def _pack_item_full(self, item: RequestItemModel) -> dict[str, Any]:
-        """
-        Monta o payload do item + fields + labels type/status.
-        """
-        type_map = self._type_repo.get_map_by_ids(
-            [int(item.request_type_id)] if item.request_type_id is not None else [])
-        status_map = self._status_repo.get_map_by_ids(
-            [int(item.request_status_id)] if item.request_status_id is not None else [])
-        fields_map = self._field_repo.list_by_item_ids([int(item.id)])
+        return items, fields_map, type_map, status_map
 
-        t = type_map.get(int(item.request_type_id)
-                         ) if item.request_type_id is not None else None
-        s = status_map.get(int(item.request_status_id)
-                           ) if item.request_status_id is not None else None
-        f_list = fields_map.get(int(item.id), []) or []
+    def _pack_item_payload(
+        self,
+        it: RequestItemModel,
+        fields_map: dict,
+        type_map: dict,
+        status_map: dict,
+    ) -> dict[str, Any]:
+        t = type_map.get(int(it.request_type_id)
+                         ) if it.request_type_id is not None else None
+        s = status_map.get(int(it.request_status_id)
+                           ) if it.request_status_id is not None else None
+        f_list = fields_map.get(int(it.id), []) or []
 
         return {
-            "id": int(item.id),
-            "request_id": int(item.request_id),
-            "request_type_id": int(item.request_type_id) if item.request_type_id is not None else None,
-            "request_status_id": int(item.request_status_id) if item.request_status_id is not None else None,
+            "id": int(it.id),
+            "request_id": int(it.request_id),
+            "request_type_id": int(it.request_type_id) if it.request_type_id is not None else None,
+            "request_status_id": int(it.request_status_id) if it.request_status_id is not None else None,
             "request_type": (
                 {"id": int(t.id), "type_name": str(
                     getattr(t, "type_name", None))}
@@ -188,9 +136,9 @@ class RequestService:
                 if s is not None
                 else None
             ),
-            "product_id": int(item.product_id) if item.product_id is not None else None,
-            "created_at": self._iso(item.created_at),
-            "updated_at": self._iso(item.updated_at),
+            "product_id": int(it.product_id) if it.product_id is not None else None,
+            "created_at": self._iso(it.created_at),
+            "updated_at": self._iso(it.updated_at),
             "fields": [
                 {
                     "id": int(f.id),
@@ -207,13 +155,63 @@ class RequestService:
             ],
         }
 
+    def _pack_request_full(self, req: RequestModel, graph: tuple | None = None) -> dict[str, Any]:
+        """
+        Monta um payload "completo" do request (similar ao GET /api/requests/<id>),
+        sem depender da camada API/schemas (mantém camadas).
+        """
+        items, fields_map, type_map, status_map = graph or self._load_request_graph(req)
+
+        return {
+            "id": int(req.id),
+            "message_id": int(req.message_id),
+            "created_by": int(req.created_by),
+            "created_at": self._iso(req.created_at),
+            "updated_at": self._iso(req.updated_at),
+            "items": [
+                self._pack_item_payload(it, fields_map, type_map, status_map)
+                for it in items
+            ],
+        }
+
+    def _pack_item_full(self, item: RequestItemModel, graph: tuple | None = None) -> dict[str, Any]:
+        """
+        Monta o payload do item + fields + labels type/status.
+        Com `graph` (de _load_request_graph) reaproveita o que já foi carregado.
+        """
+        if graph is not None and any(int(i.id) == int(item.id) for i in graph[0]):
+            _, fields_map, type_map, status_map = graph
+            return self._pack_item_payload(item, fields_map, type_map, status_map)
+
+        type_map = self._type_repo.get_map_by_ids(
+            [int(item.request_type_id)] if item.request_type_id is not None else [])
+        status_map = self._status_repo.get_map_by_ids(
+            [int(item.request_status_id)] if item.request_status_id is not None else [])
+        fields_map = self._field_repo.list_by_item_ids([int(item.id)])
+
+        return self._pack_item_payload(item, fields_map, type_map, status_map)
+
     # ---------------- Realtime events ----------------
-    def _emit_request_created(self, *, req: RequestModel, conversation_id: int, created_by: int) -> None:
+    def _emit_request_created(
+        self,
+        *,
+        req: RequestModel,
+        conversation_id: int,
+        created_by: int,
+        graph: tuple | None = None,
+    ) -> None:
         if not self._notifier:
             return
 
+        # ninguém conectado receberia: não monta o request completo
+        owner_id = self._conversation_owner_id(conversation_id)
+        if not self._notifier.has_audience(
+            conversation_id=int(conversation_id), conversation_owner_id=owner_id
+        ):
+            return
+
         # ✅ payload completo para o front não precisar fazer GET extra
-        request_payload = self._pack_request_full(req)
+        request_payload = self._pack_request_full(req, graph)
 
         evt = RequestCreatedEvent(
             request_id=int(req.id),
@@ -223,6 +221,8 @@ class RequestService:
             created_at_iso=req.created_at.astimezone(timezone.utc).isoformat(),
             # ✅ novo campo
             request=request_payload,
+            version=int(req.version or 0),
+            conversation_owner_id=owner_id,
         )
         self._notifier.notify_request_created(evt)
 
@@ -234,16 +234,39 @@ class RequestService:
         item: RequestItemModel,
         changed_by: int,
         change_kind: str,
+        fields: list[dict[str, Any]] | None = None,
     ) -> None:
+        """
+        Evento em formato delta: status/tipo do item + só os campos alterados
+        (`fields`: [{"id", ...valores novos}]) e a nova versão do request.
+        Cliente que perceber salto de versão pede snapshot (request:resync).
+        """
         if not self._notifier:
             return
 
         dt = item.updated_at or item.created_at
         iso = dt.astimezone(timezone.utc).isoformat() if dt else ""
 
-        # ✅ payload completo do request + item
-        request_payload = self._pack_request_full(req)
-        item_payload = self._pack_item_full(item)
+        # a versão avança mesmo sem ouvintes (quem conectar depois compara a partir dela)
+        version = self._req_repo.bump_version(int(req.id))
+
+        owner_id = self._conversation_owner_id(conversation_id)
+        if not self._notifier.has_audience(
+            conversation_id=int(conversation_id), conversation_owner_id=owner_id
+        ):
+            return
+
+        changes: dict[str, Any] = {
+            "item": {
+                "id": int(item.id),
+                "request_type_id": int(item.request_type_id) if item.request_type_id is not None else None,
+                "request_status_id": int(item.request_status_id) if item.request_status_id is not None else None,
+                "product_id": int(item.product_id) if item.product_id is not None else None,
+                "updated_at": self._iso(item.updated_at),
+            },
+        }
+        if fields:
+            changes["fields"] = fields
 
         evt = RequestItemChangedEvent(
             request_id=int(req.id),
@@ -255,9 +278,10 @@ class RequestService:
             request_status_id=int(
                 item.request_status_id) if item.request_status_id is not None else None,
             updated_at_iso=iso,
-            # ✅ novos campos
-            request=request_payload,
-            item=item_payload,
+            conversation_owner_id=owner_id,
+            version=version,
+            request_owner_id=int(req.created_by),
+            changes=changes,
         )
         self._notifier.notify_request_item_changed(evt)
 
@@ -267,11 +291,21 @@ class RequestService:
         if row is None:
             raise NotFoundError("Conversa não encontrada.")
         conv, _, _ = row
+        self._conversation_owners[int(conversation_id)] = int(conv.created_by)
         if role_id in (Role.ADMIN, Role.ANALYST):
             return
         if conv.created_by != user_id:
             raise ForbiddenError("Acesso negado.")
 
+    def _conversation_owner_id(self, conversation_id: int) -> int | None:
+        owner_id = self._conversation_owners.get(int(conversation_id))
+        if owner_id is None:
+            row = self._conv_repo.get_row_by_id(conversation_id)
+            if row is not None:
+                owner_id = int(row[0].created_by)
+                self._conversation_owners[int(conversation_id)] = owner_id
+        return owner_id
+
     def _conversation_id_from_message(self, message_id: int) -> int:
         row = self._msg_repo.get_row(message_id=message_id)
         if row is None:
@@ -411,7 +445,9 @@ class RequestService:
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
         date_mode: str = "AUTO",
-    ) -> tuple[list[dict], int]:
+        cursor: tuple[datetime, int] | None = None,
+        count_mode: str = "exact",
+    ) -> tuple[list[dict], int | None]:
         created_by_user_id: int | None = None
         if role_id == Role.USER:
             created_by_user_id = user_id
@@ -429,6 +465,8 @@ class RequestService:
             date_from=date_from,
             date_to=date_to,
             date_mode=date_mode,
+            cursor=cursor,
+            count_mode=count_mode,
         )
 
         type_ids = list({int(r["request_type_id"])
@@ -449,7 +487,7 @@ class RequestService:
             r["request_status"] = {
                 "id": s.id, "status_name": s.status_name} if s is not None else None
 
-        return rows, int(total)
+        return rows, (int(total) if total is not None else None)
     
     def count_requests(self,*, user_id:int, role_id:int, type_id:Optional[int], status_id:Optional[int])->int:
         created_by_user_id: int | None = None
@@ -611,6 +649,7 @@ class RequestService:
                 ]
                 self._field_repo.add_many(field_models)
 
+        # request:created leva o request completo (versão 0); o item_changed é só delta
         self._emit_request_created(
             req=req, conversation_id=conversation_id, created_by=created_by)
         if created_first_item is not None:
@@ -653,6 +692,65 @@ class RequestService:
 
         return req, items, fields_map, type_map, status_map
 
+    def get_request_snapshot(self, *, request_id: int, user_id: int, role_id: int) -> dict[str, Any]:
+        """
+        Snapshot completo + versão atual (resposta ao request:resync do socket,
+        quando o cliente detecta um salto na sequência de versões).
+        """
+        req = self._req_repo.get_by_id(request_id)
+        if req is None:
+            raise NotFoundError("Requisição não encontrada.")
+
+        conversation_id = self._conversation_id_from_message(req.message_id)
+        self._ensure_access_by_conversation(
+            conversation_id=conversation_id, user_id=user_id, role_id=role_id)
+
+        return {
+            "request_id": int(req.id),
+            "conversation_id": int(conversation_id),
+            "version": int(req.version or 0),
+            "request": self._pack_request_full(req),
+        }
+
+    def get_requests_for_conversation(
+        self,
+        *,
+        conversation_id: int,
+        requests: list[RequestModel],
+        user_id: int,
+        role_id: int,
+    ) -> dict[int, tuple]:
+        """
+        Versão em lote do get_request para as requests de uma mesma conversa.
+        Valida o acesso uma única vez e carrega itens/fields/tipos/status
+        com um número fixo de queries.
+        Retorna {request_id: (req, items, fields_map, type_map, status_map)}.
+        """
+        if not requests:
+            return {}
+
+        self._ensure_access_by_conversation(
+            conversation_id=conversation_id, user_id=user_id, role_id=role_id)
+
+        request_ids = [int(r.id) for r in requests]
+        items_map = self._item_repo.list_by_request_ids(request_ids)
+
+        all_items = [it for items in items_map.values() for it in items]
+        fields_map = self._field_repo.list_by_item_ids([int(i.id) for i in all_items])
+
+        type_ids = list({int(i.request_type_id)
+                        for i in all_items if i.request_type_id is not None})
+        status_ids = list({int(i.request_status_id)
+                          for i in all_items if i.request_status_id is not None})
+
+        type_map = self._type_repo.get_map_by_ids(type_ids)
+        status_map = self._status_repo.get_map_by_ids(status_ids)
+
+        return {
+            int(req.id): (req, items_map.get(int(req.id), []), fields_map, type_map, status_map)
+            for req in requests
+        }
+
     def delete_request(self, *, request_id: int, user_id: int, role_id: int) -> None:
         req = self._req_repo.get_by_id(request_id)
         if req is None:
@@ -768,6 +866,7 @@ class RequestService:
             item=item2,
             changed_by=user_id,
             change_kind="FIELD_FLAG",
+            fields=[{"id": int(field_id), "field_tag": str(field.field_tag), "field_flag": field_flag}],
         )
 
     def delete_item(self, *, item_id: int, user_id: int, role_id: int) -> None:
@@ -862,6 +961,7 @@ class RequestService:
             item=item2,
             changed_by=user_id,
             change_kind="FIELDS",
+            fields=[{"id": int(field_id), "field_tag": str(field.field_tag), **values}],
         )
 
     def delete_field(self, *, field_id: int, user_id: int, role_id: int) -> None:
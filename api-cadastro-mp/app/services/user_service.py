@@ -108,6 +108,17 @@ class UserService:
         if not ok:
             raise UnauthorizedError("Credenciais inválidas.")
 
+        # ✅ senha correta em mãos: atualiza hashes com algoritmo/custo antigos
+        # (senhas legadas abaixo do mínimo atual ficam como estão)
+        if len(password) >= 8 and PasswordHasher.needs_rehash(
+            algo=user.password_algo, iterations=user.password_iterations
+        ):
+            password_hash, password_salt, algo, iterations = PasswordHasher.hash_password(password)
+            user.password_hash = password_hash
+            user.password_salt = password_salt
+            user.password_algo = algo
+            user.password_iterations = iterations
+
         user.last_login = datetime.utcnow()
         return user
 
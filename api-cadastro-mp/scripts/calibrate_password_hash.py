@@ -0,0 +1,44 @@
+# api-cadastro-mp/scripts/calibrate_password_hash.py
+"""
+Mede neste servidor o custo de hash de senha para um tempo-alvo por hash.
+
+Rode na máquina de produção (mesma CPU dos workers) e copie o resultado
+para o .env. Usuários com custo antigo são refeitos no próximo login.
+
+Uso:
+  python scripts/calibrate_password_hash.py [--algo pbkdf2_sha256|scrypt] [--target-ms 250]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.infrastructure.security.password_hasher import calibrate  # noqa: E402
+
+
+_ENV_BY_ALGO = {
+    "pbkdf2_sha256": "PASSWORD_PBKDF2_ITERATIONS",
+    "scrypt": "PASSWORD_SCRYPT_N",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibra o custo do hash de senha.")
+    parser.add_argument("--algo", choices=sorted(_ENV_BY_ALGO), default="pbkdf2_sha256")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    args = parser.parse_args()
+
+    result = calibrate(args.algo, target_ms=max(1.0, args.target_ms))
+
+    print(f"[controle-mp] {result['algo']}: ~{result['measured_ms']} ms por hash")
+    print(f"PASSWORD_HASH_ALGO={args.algo}")
+    print(f"{_ENV_BY_ALGO[args.algo]}={result['cost']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# api-cadastro-mp/scripts/sync_totvs_products.py
+"""
+Sincroniza o espelho local do TOTVS (tbTotvsProductMirror).
+
+Incremental (padrão), pela marca d'água em tbTotvsSyncState:
+  - SB1010 com R_E_C_N_O_ > last_sb1_recno (produtos novos);
+  - SA5010 com R_E_C_N_O_ > last_sa5_recno (fornecedores novos) -> relê esses produtos.
+
+--full relê todo o SB1010 (pega alterações/deleções em registros já existentes,
+que não mudam de R_E_C_N_O_). Sugestão: incremental a cada poucos minutos e
+--full uma vez por dia.
+
+Uso:
+  python scripts/sync_totvs_products.py [--full] [--batch-size 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.infrastructure.database.session import db_session  # noqa: E402
+from app.repositories.totvs_product_mirror_repository import TotvsProductMirrorRepository  # noqa: E402
+from app.repositories.totvs_product_repository import (  # noqa: E402
+    MIRROR_SYNC_NAME,
+    TotvsProductRepository,
+)
+
+
+def sync(*, full: bool, batch_size: int) -> None:
+    totvs = TotvsProductRepository()
+    started_at = datetime.now(timezone.utc)
+
+    with db_session() as session:
+        mirror = TotvsProductMirrorRepository(session)
+        state = mirror.get_sync_state(MIRROR_SYNC_NAME)
+
+        # 1) produtos (SB1010) por R_E_C_N_O_
+        after_sb1 = 0 if full else int(state.last_sb1_recno or 0)
+        products_count = 0
+        while True:
+            rows, last_recno = totvs.list_product_changes(after_recno=after_sb1, limit=batch_size)
+            if last_recno == after_sb1:
+                break
+
+            mirror.upsert_many(rows, synced_at=started_at)
+            after_sb1 = last_recno
+            products_count += len(rows)
+
+            state.last_sb1_recno = after_sb1
+            session.commit()
+
+        # 2) fornecedores (SA5010): relê os produtos afetados
+        after_sa5 = int(state.last_sa5_recno or 0)
+        suppliers_count = 0
+        while True:
+            codes, last_recno = totvs.list_products_with_supplier_changes(
+                after_recno=after_sa5, limit=batch_size
+            )
+            # só para quando o SA5010 não devolve linhas; lote sem A5_PRODUTO
+            # utilizável ainda avança a marca d'água
+            if last_recno == after_sa5:
+                break
+
+            # no --full os produtos já vieram com fornecedores atualizados
+            if codes and not full:
+                rows = totvs.list_product_rows_for_mirror(codes)
+                mirror.upsert_many(rows, synced_at=started_at)
+                suppliers_count += len(rows)
+
+            after_sa5 = last_recno
+            state.last_sa5_recno = after_sa5
+            session.commit()
+
+        state.last_synced_at = started_at
+
+    print(
+        f"[controle-mp] Espelho TOTVS sincronizado ({'full' if full else 'incremental'}): "
+        f"produtos={products_count} relidos_por_fornecedor={suppliers_count} "
+        f"last_sb1_recno={after_sb1} last_sa5_recno={after_sa5}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sincroniza o espelho local do TOTVS.")
+    parser.add_argument("--full", action="store_true", help="relê todo o SB1010")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    sync(full=args.full, batch_size=max(1, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
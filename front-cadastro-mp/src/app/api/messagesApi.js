@@ -15,6 +15,28 @@ export async function listMessagesApi(
 	return data; // lista de MessageResponse :contentReference[oaicite:9]{index=9}
 }
 
+/**
+ * Paginação por cursor (keyset).
+ * - sem beforeId/afterId: mensagens mais recentes
+ * - beforeId: mensagens anteriores (scroll para trás)
+ * - afterId: mensagens posteriores
+ * Retorna { items, limit, next_cursor, has_more }.
+ */
+export async function listMessagesPageApi(
+	conversationId,
+	{ limit = 50, beforeId = null, afterId = null } = {},
+) {
+	const params = { limit };
+	if (afterId != null) params.after_id = afterId;
+	else params.before_id = beforeId ?? "";
+
+	const { data } = await httpClient.get(
+		`/conversations/${conversationId}/messages`,
+		{ params },
+	);
+	return data;
+}
+
 export async function createMessageApi(conversationId, payload) {
 	// payload: { body?, message_type_id, files?, create_request? } :contentReference[oaicite:10]{index=10}
 	const { data } = await httpClient.post(
@@ -8,6 +8,7 @@ export async function listProductsApi({
   flag = "all",
   date_from = null, // YYYY-MM-DD
   date_to = null,   // YYYY-MM-DD
+  sort = null,      // recent | relevance
 } = {}) {
   const params = { limit, offset };
 
@@ -15,6 +16,7 @@ export async function listProductsApi({
   if (flag) params.flag = flag;
   if (date_from) params.date_from = date_from;
   if (date_to) params.date_to = date_to;
+  if (sort) params.sort = sort;
 
   const { data } = await httpClient.get("/products", { params });
   return data;
@@ -110,3 +110,11 @@ export async function getTotvsByProductCodeApi(productCode) {
   const { data } = await httpClient.get(`/products/totvs/${encodeURIComponent(code)}`);
   return data?.totvs ?? null;
 }
+
+// VÁRIOS PRODUTOS TOTVS EM UMA ÚNICA CHAMADA
+export async function getTotvsByProductCodesApi(productCodes) {
+  const codes = [...new Set((productCodes || []).map((c) => String(c || "").trim()).filter(Boolean))];
+  if (codes.length === 0) return { items: {}, not_found: [] };
+  const { data } = await httpClient.post(`/products/totvs/batch`, { codes });
+  return { items: data?.items ?? {}, not_found: data?.not_found ?? [] };
+}
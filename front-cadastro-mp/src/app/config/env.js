@@ -3,6 +3,8 @@
 const base = import.meta.env.VITE_API_BASE_URL ?? "";
 const prefix = import.meta.env.VITE_API_PREFIX ?? "/api";
 const socketPathRaw = import.meta.env.VITE_SOCKET_PATH ?? "/socket.io";
+// "websocket" quando o backend roda com vários workers (sem sticky session)
+const socketTransportsRaw = import.meta.env.VITE_SOCKET_TRANSPORTS ?? "websocket,polling";
 
 // Normaliza para não duplicar barras
 function trimEndSlash(s) {
@@ -13,4 +15,8 @@ export const env = {
   apiBaseUrl: trimEndSlash(base),
   apiPrefix: prefix.startsWith("/") ? prefix : `/${prefix}`,
   socketPath: socketPathRaw.startsWith("/") ? socketPathRaw : `/${socketPathRaw}`,
+  socketTransports: socketTransportsRaw
+    .split(",")
+    .map((t) => t.trim())
+    .filter(Boolean),
 };
@@ -13,6 +13,7 @@ import {
   connectSocket,
   disconnectSocket,
   setSocketAuthToken,
+  requestResync,
 } from "./socket";
 
 import {
@@ -205,6 +206,28 @@ export function RealtimeProvider({ children }) {
   const allowedConvIdsRef = useRef(new Set());
   const prevConvIdsRef = useRef(new Set());
 
+  // request_id -> última versão vista (request:item_changed é delta)
+  const requestVersionsRef = useRef(new Map());
+
+  /**
+   * Registra a versão recebida. Retorna true se houve salto
+   * (evento perdido) e o cliente precisa de snapshot.
+   * Evento consolidado pelo servidor cobre from_version..version.
+   */
+  function trackRequestVersion(requestId, version, fromVersion) {
+    const rid = Number(requestId);
+    const v = Number(version);
+    if (!rid || !Number.isFinite(v)) return false;
+
+    const known = requestVersionsRef.current.get(rid);
+    if (known != null && v <= known) return false;
+
+    const first = Number.isFinite(Number(fromVersion)) ? Number(fromVersion) : v;
+
+    requestVersionsRef.current.set(rid, v);
+    return known != null && first > known + 1;
+  }
+
   useEffect(() => {
     allowedConvIdsRef.current = new Set(
       (conversations ?? []).map((c) => Number(c.id)).filter(Boolean)
@@ -489,10 +512,12 @@ export function RealtimeProvider({ children }) {
     }
   }
 
-  async function refreshAll() {
+  // unread: o resumo só é buscado na carga inicial e na (re)conexão;
+  // no meio da sessão os contadores chegam por unread:update
+  async function refreshAll({ unread = true } = {}) {
     await Promise.allSettled([
       refreshConversations(),
-      refreshUnreadSummary(),
+      unread ? refreshUnreadSummary() : null,
       refreshCreatedRequestsCount(),
     ]);
   }
@@ -504,7 +529,7 @@ export function RealtimeProvider({ children }) {
 
     syncTimerRef.current = setTimeout(() => {
       syncTimerRef.current = null;
-      refreshAll();
+      refreshAll({ unread: false });
     }, delay);
   }
 
@@ -640,10 +665,7 @@ export function RealtimeProvider({ children }) {
 
       toastSuccess(title ? `Nova mensagem de ${who} • ${title}` : `Nova mensagem de ${who}`);
 
-      setUnreadCounts((prevCounts) => ({
-        ...(prevCounts ?? {}),
-        [cid]: Number((prevCounts ?? {})[cid] ?? 0) + 1,
-      }));
+      // contador vem do servidor (unread:update)
 
       scheduleSyncAll(350);
 
@@ -653,6 +675,18 @@ export function RealtimeProvider({ children }) {
       });
     };
 
+    // ✅ contador de não lidas mantido pelo servidor (mensagem nova, exclusão, leitura)
+    const onUnreadUpdate = (payload) => {
+      const cid = Number(payload?.conversation_id);
+      const count = Number(payload?.unread_count);
+      if (!cid || !Number.isFinite(count)) return;
+
+      setUnreadCounts((prevCounts) => ({
+        ...(prevCounts ?? {}),
+        [cid]: count,
+      }));
+    };
+
     const onConversationNew = (payload) => {
       const cid = conversationIdOf(payload);
       const t = stableText(payload?.title ?? payload?.subject ?? "");
@@ -689,8 +723,12 @@ export function RealtimeProvider({ children }) {
         Number(payload?.created_by ?? payload?.user_id ?? payload?.owner_id) ||
         senderIdOf(payload);
 
+      trackRequestVersion(reqId, payload?.version);
+
+      // com request_id a chave basta; o fingerprint (autor+conversa) descartaria
+      // uma segunda solicitação criada logo em seguida na mesma conversa
       const fp = `request:created|fp:${sid}|${conversationIdOf(payload)}`;
-      const keys = [reqId ? `request:created|rid:${reqId}` : "", fp];
+      const keys = reqId ? [`request:created|rid:${reqId}`] : [fp];
       if (markSeenAny(keys)) return;
 
       const currentUserId = Number(activeUserIdRef.current);
@@ -718,10 +756,20 @@ export function RealtimeProvider({ children }) {
         payload?.change_kind
       )}|${statusId}|${itemId}`;
 
-      const keys = [
-        itemId ? `request:item_changed|item:${itemId}|st:${statusId}` : "",
-        fp,
-      ];
+      const reqId = Number(payload?.request_id);
+      const version = Number(payload?.version);
+      const isVersioned = Boolean(reqId) && Number.isFinite(version);
+
+      // versão registrada antes do dedupe: um delta nunca fica sem contabilizar
+      if (trackRequestVersion(reqId, payload?.version, payload?.from_version ?? payload?.version)) {
+        requestResync(reqId);
+      }
+
+      // delta versionado: (request, versão) identifica o evento; item+status
+      // descartaria uma segunda alteração real (campo/flag) no mesmo item
+      const keys = isVersioned
+        ? [`request:item_changed|rid:${reqId}|v:${version}`]
+        : [itemId ? `request:item_changed|item:${itemId}|st:${statusId}` : "", fp];
       if (markSeenAny(keys)) return;
 
       const notify = shouldNotifyRequestChange(payload, {
@@ -743,6 +791,14 @@ export function RealtimeProvider({ children }) {
       await syncAfterRequestChange(statusId);
     };
 
+    const onRequestSnapshot = (payload) => {
+      const reqId = Number(payload?.request_id);
+      const v = Number(payload?.version);
+      if (reqId && Number.isFinite(v)) requestVersionsRef.current.set(reqId, v);
+
+      scheduleSyncAll(150);
+    };
+
     const onProductCreated = (payload) => {
       const pid = productIdOf(payload);
       if (!pid) return;
@@ -766,9 +822,11 @@ export function RealtimeProvider({ children }) {
     };
 
     socket.on("message:new", onMessageNew);
+    socket.on("unread:update", onUnreadUpdate);
     socket.on("conversation:new", onConversationNew);
     socket.on("request:created", onRequestCreated);
     socket.on("request:item_changed", onRequestItemChanged);
+    socket.on("request:snapshot", onRequestSnapshot);
     socket.on("product:created", onProductCreated);
     socket.on("product:updated", onProductUpdated);
 
@@ -789,9 +847,11 @@ export function RealtimeProvider({ children }) {
       socket.io.off?.("reconnect", onReconnect);
 
       socket.off("message:new", onMessageNew);
+      socket.off("unread:update", onUnreadUpdate);
       socket.off("conversation:new", onConversationNew);
       socket.off("request:created", onRequestCreated);
       socket.off("request:item_changed", onRequestItemChanged);
+      socket.off("request:snapshot", onRequestSnapshot);
       socket.off("product:created", onProductCreated);
       socket.off("product:updated", onProductUpdated);
     };
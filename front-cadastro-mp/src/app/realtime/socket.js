@@ -24,11 +24,12 @@ function guessTokenFromStorage() {
 
 const baseUrl = env?.apiBaseUrl || window.location.origin;
 const socketPath = env?.socketPath || "/socket.io";
+const socketTransports = env?.socketTransports?.length ? env.socketTransports : ["websocket", "polling"];
 
 export const socket = io(baseUrl, {
   path: socketPath,
   autoConnect: false,
-  transports: ["websocket", "polling"],
+  transports: socketTransports,
   reconnection: true,
   reconnectionAttempts: Infinity,
   reconnectionDelay: 500,
@@ -117,6 +118,17 @@ export function joinConversationRoom(conversationId) {
   socket.emit("conversation:join", { conversation_id: id });
 }
 
+/**
+ * Pede o snapshot completo de um request (resposta: "request:snapshot").
+ * Usado quando a sequência de versões de request:item_changed tem buraco.
+ */
+export function requestResync(requestId) {
+  const id = Number(requestId);
+  if (!id) return;
+  ensureConnected();
+  socket.emit("request:resync", { request_id: id });
+}
+
 export function leaveConversationRoom(conversationId) {
   const id = Number(conversationId);
   if (!id) return;